@@ -8,17 +8,45 @@ automation flows.
 
 from __future__ import annotations
 
-from .api import options_from_mapping, run_sync_payload
-from .core import sync
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .api import options_from_mapping, run_sync_payload
+    from .core import sync
+
+    __version__: str
 
 __all__ = ["__version__", "options_from_mapping", "run_sync_payload", "sync"]
 
-try:
-    from importlib.metadata import PackageNotFoundError, version
-except Exception:  # pragma: no cover - optional fallback for rare environments
-    from importlib_metadata import PackageNotFoundError, version  # type: ignore
+# Heavy submodules (packaging, portalocker) load on first access so that
+# `reqsync version` / `reqsync --help` and `import reqsync.cli` stay cheap.
+_LAZY_EXPORTS: dict[str, str] = {
+    "options_from_mapping": ".api",
+    "run_sync_payload": ".api",
+    "sync": ".core",
+}
+
+
+def _resolve_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except Exception:  # pragma: no cover - optional fallback for rare environments
+        from importlib_metadata import PackageNotFoundError, version  # type: ignore
+
+    try:
+        return version("reqsync")
+    except PackageNotFoundError:
+        return "0.0.0+dev"
+
 
-try:
-    __version__ = version("reqsync")
-except PackageNotFoundError:
-    __version__ = "0.0.0+dev"
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value: Any = _resolve_version()
+    else:
+        module_name = _LAZY_EXPORTS.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
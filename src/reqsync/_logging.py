@@ -10,11 +10,20 @@ from __future__ import annotations
 import logging
 import sys
 from pathlib import Path
+from typing import TextIO
+
+# Key and handlers from the last setup_logging call. Repeated calls with the
+# same level/log file/stderr stream (e.g. MCP or API loops) reuse them instead
+# of reopening the log file each time.
+_CURRENT: tuple[int, Path | None, TextIO] | None = None
+_CURRENT_HANDLERS: list[logging.Handler] = []
 
 
 def setup_logging(verbosity: int, quiet: bool, log_file: Path | None) -> None:
     """Configure root logging based on CLI verbosity flags."""
 
+    global _CURRENT, _CURRENT_HANDLERS
+
     if quiet:
         level = logging.WARNING
     elif verbosity >= 2:
@@ -25,6 +34,14 @@ def setup_logging(verbosity: int, quiet: bool, log_file: Path | None) -> None:
         level = logging.WARNING
 
     root = logging.getLogger()
+    key = (level, log_file, sys.stderr)
+    if key == _CURRENT and root.handlers == _CURRENT_HANDLERS:
+        return
+
+    for handler in _CURRENT_HANDLERS:
+        if isinstance(handler, logging.FileHandler):
+            handler.close()
+
     root.handlers.clear()
     root.setLevel(level)
 
@@ -40,5 +57,8 @@ def setup_logging(verbosity: int, quiet: bool, log_file: Path | None) -> None:
         file_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
         root.addHandler(file_handler)
 
+    _CURRENT = key
+    _CURRENT_HANDLERS = list(root.handlers)
+
 
 __all__ = ["setup_logging"]
@@ -8,15 +8,29 @@ Python, CLI wrappers, or model-tool adapters.
 
 from __future__ import annotations
 
+import sys
 from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import IntEnum
 from pathlib import Path
-from typing import Literal, TypedDict
+from typing import Literal, TypedDict, cast
 
 Policy = Literal["lower-bound", "floor-only", "floor-and-cap", "update-in-place"]
+
+# Interned once so every Options built from loose input shares the same objects.
+POLICIES: tuple[Policy, ...] = cast(
+    "tuple[Policy, ...]",
+    tuple(sys.intern(name) for name in ("lower-bound", "floor-only", "floor-and-cap", "update-in-place")),
+)
 FileRole = Literal["root", "requirement", "constraint"]
 
+# Shared default requirements path; callers building base Options from it let
+# merge_options detect "still on the default" with an identity check.
+DEFAULT_REQUIREMENTS_PATH = Path("requirements.txt")
+
+# `dataclass(slots=True)` needs Python 3.10+; older interpreters keep __dict__.
+_SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class ExitCode(IntEnum):
     """Stable process exit codes for CLI and MCP callers."""
@@ -35,7 +49,7 @@ class ExitCode(IntEnum):
     CHANGES_WOULD_BE_MADE = 11
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Options:
     """Runtime options for a single reqsync operation."""
 
@@ -67,7 +81,7 @@ class Options:
     last_wins: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Change:
     """A single package-line rewrite."""
 
@@ -78,7 +92,7 @@ class Change:
     file: Path
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileChange:
     """All changes for one requirements file."""
 
@@ -87,9 +101,13 @@ class FileChange:
     changes: list[Change] = field(default_factory=list)
     original_text: str = ""
     new_text: str = ""
+    # Line splits already produced while rewriting; make_diff reuses them
+    # instead of splitting both texts again.
+    original_lines: list[str] | None = field(default=None, repr=False, compare=False)
+    new_lines: list[str] | None = field(default=None, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ResolvedFile:
     """A discovered requirements file and how it was reached."""
 
@@ -97,7 +115,7 @@ class ResolvedFile:
     role: FileRole
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Result:
     """Structured outcome of a sync call."""
 
@@ -131,6 +149,8 @@ class JsonResult(TypedDict):
 
 
 __all__ = [
+    "DEFAULT_REQUIREMENTS_PATH",
+    "POLICIES",
     "Change",
     "ExitCode",
     "FileChange",
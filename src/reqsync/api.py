@@ -12,7 +12,7 @@ from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
-from ._types import JsonResult, Options
+from ._types import DEFAULT_REQUIREMENTS_PATH, JsonResult, Options
 from .config import merge_options
 from .core import sync
 from .report import result_to_json
@@ -21,7 +21,7 @@ from .report import result_to_json
 def options_from_mapping(payload: Mapping[str, Any], *, default_path: Path | None = None) -> Options:
     """Create validated Options from arbitrary mapping input."""
 
-    base = Options(path=default_path or Path("requirements.txt"))
+    base = Options(path=default_path or DEFAULT_REQUIREMENTS_PATH)
     return merge_options(base, dict(payload))
 
 
@@ -8,7 +8,6 @@ project config files and can emit either human summaries or JSON payloads.
 
 from __future__ import annotations
 
-import json
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
@@ -16,13 +15,11 @@ from typing import Any, Optional
 import typer
 from click.core import ParameterSource
 
-from . import __version__
 from ._logging import setup_logging
-from ._types import ExitCode, JsonResult, Options
+from ._types import DEFAULT_REQUIREMENTS_PATH, ExitCode, JsonResult, Options
 from .config import load_project_config, merge_options
-from .core import sync
 from .errors import ReqsyncError
-from .report import result_to_json, write_json_report
+from .report import dumps_json, result_to_json, write_json_report
 
 
 class PolicyEnum(str, Enum):
@@ -118,6 +115,8 @@ Use:
 
 def _version_callback(value: bool) -> None:
     if value:
+        from . import __version__
+
         typer.echo(f"reqsync {__version__}")
         raise typer.Exit()
 
@@ -136,28 +135,28 @@ def app_callback(
     """Global CLI options for reqsync."""
 
 
+# `run` parameters that steer CLI output/config loading rather than Options fields.
+_NON_OPTION_PARAMS = frozenset(("ctx", "output", "stdout_json", "use_config"))
+
+
 def _build_options(ctx: typer.Context, use_config: bool) -> Options:
-    options = Options(path=Path("requirements.txt"))
+    options = Options(path=DEFAULT_REQUIREMENTS_PATH)
     if use_config:
-        options = merge_options(options, load_project_config(Path(".").resolve()))
-
-    non_option_keys = {
-        "ctx",
-        "output",
-        "stdout_json",
-        "use_config",
+        project_config = load_project_config(Path(".").resolve())
+        if project_config:
+            options = merge_options(options, project_config)
+
+    get_source = ctx.get_parameter_source
+    overrides: dict[str, Any] = {
+        key: value
+        for key, value in ctx.params.items()
+        if key not in _NON_OPTION_PARAMS and get_source(key) is not ParameterSource.DEFAULT
     }
-    overrides: dict[str, Any] = {}
-    for key, value in ctx.params.items():
-        if key in non_option_keys:
-            continue
-        if ctx.get_parameter_source(key) is not ParameterSource.DEFAULT:
-            overrides[key] = value
 
     return merge_options(options, overrides)
 
 
-def _print_human_summary(payload: JsonResult, options: Options, report_path: Optional[Path]) -> None:
+def _format_human_summary(payload: JsonResult, options: Options, report_path: Optional[Path]) -> str:
     mode = "apply"
     if options.check:
         mode = "check"
@@ -168,25 +167,28 @@ def _print_human_summary(payload: JsonResult, options: Options, report_path: Opt
     files_changed = sum(1 for file_row in payload["files"] if file_row["changed"])
     changes_total = len(payload["changes"])
 
+    lines: list[str] = []
     if payload["changed"]:
-        typer.secho(f"reqsync [{mode}] -> changes detected", fg=typer.colors.YELLOW)
+        lines.append(typer.style(f"reqsync [{mode}] -> changes detected", fg=typer.colors.YELLOW))
     else:
-        typer.secho(f"reqsync [{mode}] -> already in sync", fg=typer.colors.GREEN)
+        lines.append(typer.style(f"reqsync [{mode}] -> already in sync", fg=typer.colors.GREEN))
 
-    typer.echo(f"files scanned: {files_total} | files changed: {files_changed} | package updates: {changes_total}")
+    lines.append(f"files scanned: {files_total} | files changed: {files_changed} | package updates: {changes_total}")
 
     if changes_total:
-        typer.echo("top package updates:")
+        lines.append("top package updates:")
         preview_limit = 8
         for change in payload["changes"][:preview_limit]:
             file_name = Path(change["file"]).name
-            typer.echo(f"  - {change['package']} -> {change['installed_version']} ({file_name})")
+            lines.append(f"  - {change['package']} -> {change['installed_version']} ({file_name})")
 
         if changes_total > preview_limit:
-            typer.echo(f"  ... and {changes_total - preview_limit} more")
+            lines.append(f"  ... and {changes_total - preview_limit} more")
 
     if report_path:
-        typer.echo(f"json report written: {report_path}")
+        lines.append(f"json report written: {report_path}")
+
+    return "\n".join(lines)
 
 
 def _resolve_output_mode(output: OutputModeEnum, stdout_json: bool) -> OutputModeEnum:
@@ -206,12 +208,14 @@ def _emit_result(
         report_path = write_json_report(payload, str(options.json_report))
 
     if output_mode in {OutputModeEnum.HUMAN, OutputModeEnum.BOTH}:
-        _print_human_summary(payload=payload, options=options, report_path=report_path)
+        # One echo per run: click flushes (and strips styles for non-TTYs) per call.
+        summary = _format_human_summary(payload=payload, options=options, report_path=report_path)
         if result_diff and (options.show_diff or options.dry_run):
-            typer.echo(result_diff)
+            summary = f"{summary}\n{result_diff}"
+        typer.echo(summary)
 
     if output_mode in {OutputModeEnum.JSON, OutputModeEnum.BOTH}:
-        typer.echo(json.dumps(payload, indent=2))
+        typer.echo(dumps_json(payload))
 
 
 @app.command("run", epilog=_SUBCOMMAND_HELP_FOOTER)
@@ -376,6 +380,8 @@ def run_command(
 ) -> None:
     """Run synchronization with explicit, script-friendly options."""
 
+    from .core import sync
+
     options = _build_options(ctx, use_config=use_config)
     setup_logging(verbosity=options.verbosity, quiet=options.quiet, log_file=options.log_file)
 
@@ -414,6 +420,8 @@ def help_command(
 def version_command() -> None:
     """Print installed reqsync version."""
 
+    from . import __version__
+
     typer.echo(f"reqsync {__version__}")
 
 
@@ -11,10 +11,16 @@ from __future__ import annotations
 import importlib
 import json
 import logging
+import os
+import re
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, cast
+from typing import Any
 
-from ._types import Options, Policy
+from ._types import DEFAULT_REQUIREMENTS_PATH, POLICIES, Options, Policy
 
 
 def _import_toml_like() -> Any:
@@ -36,39 +42,93 @@ def _load_toml(path: Path) -> dict[str, Any]:
     if not toml:
         return {}
     try:
-        with path.open("rb") as stream:
-            data = toml.load(stream)
+        data = toml.loads(path.read_bytes().decode("utf-8"))
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
 
 
+_CONFIG_FILE_NAMES = ("reqsync.toml", "pyproject.toml", "reqsync.json")
+
+
+def _scan_config_files(start_dir: Path) -> dict[str, tuple[int, int]]:
+    """Return (mtime_ns, size) for known config files present in start_dir.
+
+    A single directory scan replaces one stat per candidate file, which keeps
+    the common "no config at all" case to one syscall.
+    """
+
+    present: dict[str, tuple[int, int]] = {}
+    try:
+        with os.scandir(start_dir) as entries:
+            for entry in entries:
+                if entry.name in _CONFIG_FILE_NAMES and entry.is_file():
+                    stat = entry.stat()
+                    present[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return {}
+    return present
+
+
+def invalidate_config_cache() -> None:
+    """Drop memoized config file parses so the next load re-reads from disk."""
+
+    _load_config_file_cached.cache_clear()
+
+
 def load_project_config(start_dir: Path) -> dict[str, Any]:
-    """Load merged reqsync config from known project files."""
+    """Load merged reqsync config from known project files.
 
-    config: dict[str, Any] = {}
+    Individual file parses are memoized while each file's mtime and size stay
+    unchanged.
+    """
+
+    resolved = start_dir.resolve()
+    present = _scan_config_files(resolved)
+    return _read_project_config(resolved, present) if present else {}
 
-    reqsync_toml = start_dir / "reqsync.toml"
-    if reqsync_toml.exists():
-        config.update(_load_toml(reqsync_toml))
 
-    pyproject = start_dir / "pyproject.toml"
-    if pyproject.exists():
-        data = _load_toml(pyproject)
-        tool = data.get("tool") if isinstance(data.get("tool"), dict) else {}
-        section = tool.get("reqsync") if isinstance(tool, dict) else {}
-        if isinstance(section, dict):
-            config.update(section)
+def _load_config_file(path: Path) -> dict[str, Any]:
+    """Return the reqsync settings contributed by one known config file."""
 
-    reqsync_json = start_dir / "reqsync.json"
-    if reqsync_json.exists():
+    if path.name == "reqsync.json":
         try:
-            payload = json.loads(reqsync_json.read_text(encoding="utf-8"))
-            if isinstance(payload, dict):
-                config.update(payload)
+            payload = json.loads(path.read_text(encoding="utf-8"))
         except Exception as exc:
             logging.warning("Failed to parse reqsync.json: %s", exc)
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    data = _load_toml(path)
+    if path.name != "pyproject.toml":
+        return data
+
+    tool = data.get("tool") if isinstance(data.get("tool"), dict) else {}
+    section = tool.get("reqsync") if isinstance(tool, dict) else {}
+    return section if isinstance(section, dict) else {}
+
+
+@lru_cache(maxsize=32)
+def _load_config_file_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Parse one config file, memoized until its mtime or size changes."""
+
+    return _load_config_file(Path(path))
+
+
+def _read_project_config(start_dir: Path, present: Mapping[str, tuple[int, int]]) -> dict[str, Any]:
+    files = [(str(start_dir / name), *present[name]) for name in _CONFIG_FILE_NAMES if name in present]
+
+    # Opt-in overlap of file reads for slow (networked / AV-scanned) project
+    # directories; thread start-up costs more than it saves on local disks.
+    if len(files) > 1 and _to_bool(os.environ.get("REQSYNC_PARALLEL_CONFIG"), False):
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            sections = list(executor.map(lambda file: _load_config_file_cached(*file), files))
+    else:
+        sections = [_load_config_file_cached(*file) for file in files]
 
+    config: dict[str, Any] = {}
+    for section in sections:
+        config.update(section)
     return config
 
 
@@ -81,24 +141,33 @@ def _to_path(value: Any) -> Path | None:
         return None
 
 
+# Package globs never contain commas or whitespace, so one scan splits and trims.
+_LIST_TOKEN_RE = re.compile(r"[^,\s]+")
+
+
 def _to_tuple(value: Any) -> tuple[str, ...]:
     if value is None:
         return ()
     if isinstance(value, (list, tuple, set)):
-        return tuple(str(item).strip() for item in value if str(item).strip())
+        return tuple(filter(None, (str(item).strip() for item in value)))
     if isinstance(value, str):
-        return tuple(item for item in (part.strip() for part in value.split(",")) if item)
+        return tuple(_LIST_TOKEN_RE.findall(value))
     return ()
 
 
+_TRUE_STRINGS = frozenset(("1", "true", "yes", "on", "y", "t"))
+_FALSE_STRINGS = frozenset(("0", "false", "no", "off", "n", "f"))
+_POLICY_BY_NAME: dict[str, Policy] = {policy: policy for policy in POLICIES}
+
+
 def _to_bool(value: Any, default: bool) -> bool:
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
     if isinstance(value, str):
         lowered = value.strip().lower()
-        if lowered in {"1", "true", "yes", "on"}:
+        if lowered in _TRUE_STRINGS:
             return True
-        if lowered in {"0", "false", "no", "off"}:
+        if lowered in _FALSE_STRINGS:
             return False
     return default
 
@@ -115,50 +184,76 @@ def _to_policy(value: Any, default: Policy) -> Policy:
         return default
 
     raw = getattr(value, "value", value)
-    allowed: set[str] = {"lower-bound", "floor-only", "floor-and-cap", "update-in-place"}
-    if isinstance(raw, str) and raw in allowed:
-        return cast(Policy, raw)
+    if isinstance(raw, str):
+        return _POLICY_BY_NAME.get(raw, default)
 
     return default
 
 
+def _to_str(value: Any, default: str) -> str:
+    return str(value)
+
+
+def _to_path_or(value: Any, default: Path | None) -> Path | None:
+    return _to_path(value) or default
+
+
+def _to_tuple_or(value: Any, default: Sequence[str]) -> Sequence[str]:
+    return _to_tuple(value) or default
+
+
+def _to_non_negative_int(value: Any, default: int) -> int:
+    return max(0, _to_int(value, default))
+
+
+# Per-field coercion schedule for merge_options, built once at import time.
+# Each coercer receives the raw override and the base value to fall back on.
+_FIELD_COERCERS: tuple[tuple[str, Callable[[Any, Any], Any]], ...] = (
+    ("follow_includes", _to_bool),
+    ("update_constraints", _to_bool),
+    ("policy", _to_policy),
+    ("allow_prerelease", _to_bool),
+    ("keep_local", _to_bool),
+    ("no_upgrade", _to_bool),
+    ("pip_timeout_sec", _to_int),
+    ("pip_args", _to_str),
+    ("only", _to_tuple_or),
+    ("exclude", _to_tuple_or),
+    ("check", _to_bool),
+    ("dry_run", _to_bool),
+    ("show_diff", _to_bool),
+    ("json_report", _to_path_or),
+    ("backup_suffix", _to_str),
+    ("timestamped_backups", _to_bool),
+    ("backup_keep_last", _to_non_negative_int),
+    ("lock_timeout_sec", _to_int),
+    ("log_file", _to_path_or),
+    ("verbosity", _to_int),
+    ("quiet", _to_bool),
+    ("system_ok", _to_bool),
+    ("allow_hashes", _to_bool),
+    ("allow_dirty", _to_bool),
+    ("last_wins", _to_bool),
+)
+
+
 def merge_options(base: Options, overrides: dict[str, Any]) -> Options:
     """Return a new options object after applying overrides to base values."""
 
+    if not overrides:
+        return base
+
+    changes: dict[str, Any] = {}
+
     config_path = _to_path(overrides.get("path"))
-    if config_path and base.path == Path("requirements.txt"):
-        effective_path = config_path
-    else:
-        effective_path = base.path
-
-    return Options(
-        path=effective_path,
-        follow_includes=_to_bool(overrides.get("follow_includes"), base.follow_includes),
-        update_constraints=_to_bool(overrides.get("update_constraints"), base.update_constraints),
-        policy=_to_policy(overrides.get("policy"), base.policy),
-        allow_prerelease=_to_bool(overrides.get("allow_prerelease"), base.allow_prerelease),
-        keep_local=_to_bool(overrides.get("keep_local"), base.keep_local),
-        no_upgrade=_to_bool(overrides.get("no_upgrade"), base.no_upgrade),
-        pip_timeout_sec=_to_int(overrides.get("pip_timeout_sec"), base.pip_timeout_sec),
-        pip_args=str(overrides.get("pip_args", base.pip_args)),
-        only=_to_tuple(overrides.get("only")) or base.only,
-        exclude=_to_tuple(overrides.get("exclude")) or base.exclude,
-        check=_to_bool(overrides.get("check"), base.check),
-        dry_run=_to_bool(overrides.get("dry_run"), base.dry_run),
-        show_diff=_to_bool(overrides.get("show_diff"), base.show_diff),
-        json_report=_to_path(overrides.get("json_report")) or base.json_report,
-        backup_suffix=str(overrides.get("backup_suffix", base.backup_suffix)),
-        timestamped_backups=_to_bool(overrides.get("timestamped_backups"), base.timestamped_backups),
-        backup_keep_last=max(0, _to_int(overrides.get("backup_keep_last"), base.backup_keep_last)),
-        lock_timeout_sec=_to_int(overrides.get("lock_timeout_sec"), base.lock_timeout_sec),
-        log_file=_to_path(overrides.get("log_file")) or base.log_file,
-        verbosity=_to_int(overrides.get("verbosity"), base.verbosity),
-        quiet=_to_bool(overrides.get("quiet"), base.quiet),
-        system_ok=_to_bool(overrides.get("system_ok"), base.system_ok),
-        allow_hashes=_to_bool(overrides.get("allow_hashes"), base.allow_hashes),
-        allow_dirty=_to_bool(overrides.get("allow_dirty"), base.allow_dirty),
-        last_wins=_to_bool(overrides.get("last_wins"), base.last_wins),
-    )
-
-
-__all__ = ["load_project_config", "merge_options"]
+    if config_path and (base.path is DEFAULT_REQUIREMENTS_PATH or base.path == DEFAULT_REQUIREMENTS_PATH):
+        changes["path"] = config_path
+
+    for name, coerce in _FIELD_COERCERS:
+        if name in overrides:
+            changes[name] = coerce(overrides[name], getattr(base, name))
+
+    return replace(base, **changes)
+
+
+__all__ = ["invalidate_config_cache", "load_project_config", "merge_options"]
@@ -8,31 +8,63 @@ rewrites, atomic backups/writes, and structured reporting for CLI/API callers.
 from __future__ import annotations
 
 import fnmatch
+import importlib
 import logging
+import os
+import re
 import shutil
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from packaging.utils import canonicalize_name
-
 from . import env as env_mod
 from . import report as report_mod
 from ._types import Change, FileChange, FileRole, Options, ResolvedFile, Result
 from .errors import MissingRequirementsFileError, PipUpgradeFailedError, WriteRollbackError
-from .io import advisory_lock, backup_file, read_text_preserve, write_text_preserve
-from .parse import find_file_links, guard_hashes, parse_line
+from .io import advisory_lock, backup_file, detach_backup, read_text_preserve, write_text_preserve
+from .parse import ParsedLine, find_file_links, guard_hashes, parse_line
 from .policy import CapStrategy, apply_policy
 
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass(frozen=True)
+class _PatternSet:
+    """Package filters split by how cheaply each pattern can be tested."""
+
+    literals: frozenset[str]
+    suffixes: tuple[str, ...]
+    globs_re: re.Pattern[str] | None
+
+    def matches(self, name: str) -> bool:
+        if name in self.literals:
+            return True
+        if self.suffixes and name.endswith(self.suffixes):
+            return True
+        return self.globs_re is not None and self.globs_re.match(name) is not None
+
 
-def _match(name: str, patterns: tuple[str, ...]) -> bool:
-    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple[str, ...]) -> _PatternSet | None:
+    """Partition package globs into literals, ``*suffix`` forms and one regex (None when empty)."""
 
+    if not patterns:
+        return None
 
-def _should_skip_pkg(pkg_name: str, only: tuple[str, ...], exclude: tuple[str, ...]) -> bool:
-    if only and not _match(pkg_name, only):
-        return True
-    if exclude and _match(pkg_name, exclude):
-        return True
-    return False
+    literals: set[str] = set()
+    suffixes: list[str] = []
+    globs: list[str] = []
+    for pattern in map(os.path.normcase, patterns):
+        if _GLOB_CHARS.isdisjoint(pattern):
+            literals.add(pattern)
+        elif pattern.startswith("*") and _GLOB_CHARS.isdisjoint(pattern[1:]):
+            suffixes.append(pattern[1:])
+        else:
+            globs.append(pattern)
+
+    globs_re = re.compile("|".join(f"(?:{fnmatch.translate(glob)})" for glob in globs)) if globs else None
+    return _PatternSet(literals=frozenset(literals), suffixes=tuple(suffixes), globs_re=globs_re)
 
 
 def _merge_role(current: FileRole, discovered: FileRole) -> FileRole:
@@ -43,22 +75,31 @@ def _merge_role(current: FileRole, discovered: FileRole) -> FileRole:
     return "constraint"
 
 
-def _resolve_files(root: Path, follow: bool) -> list[ResolvedFile]:
-    """Resolve root + linked requirement/constraint files in deterministic order."""
+def _resolve_files(root: Path, follow: bool) -> list[tuple[ResolvedFile, str, bool]]:
+    """Resolve root + linked requirement/constraint files in deterministic order.
+
+    Each entry carries the decoded text and BOM flag from the single read used
+    for link discovery, so callers do not have to read the file again.
+    """
 
     root_resolved = root.resolve()
     roles: dict[Path, FileRole] = {root_resolved: "root"}
     order: list[Path] = [root_resolved]
 
     if not follow:
-        return [ResolvedFile(path=root_resolved, role="root")]
+        text, _newline, bom = read_text_preserve(root_resolved)
+        return [(ResolvedFile(path=root_resolved, role="root"), text, bom)]
+
+    contents: dict[Path, tuple[str, bool]] = {}
 
-    queue: list[Path] = [root_resolved]
+    queue: deque[Path] = deque([root_resolved])
     while queue:
-        current = queue.pop(0)
-        text, _newline, _bom = read_text_preserve(current)
+        current = queue.popleft()
+        parent = current.parent
+        text, _newline, bom = read_text_preserve(current)
+        contents[current] = (text, bom)
         for ref in find_file_links(text.splitlines()):
-            candidate = (current.parent / ref.path).resolve()
+            candidate = (parent / ref.path).resolve()
             if not candidate.exists():
                 logging.warning("Linked requirements file not found (kept directive): %s", candidate)
                 continue
@@ -75,54 +116,88 @@ def _resolve_files(root: Path, follow: bool) -> list[ResolvedFile]:
             if merged != existing_role:
                 roles[candidate] = merged
 
-    return [ResolvedFile(path=file_path, role=roles[file_path]) for file_path in order]
+    return [(ResolvedFile(path=file_path, role=roles[file_path]), *contents[file_path]) for file_path in order]
+
+
+def _parse_lines(text: str) -> list[ParsedLine]:
+    """Split text once (keeping line endings) and parse every line."""
+
+    return [parse_line(line) for line in text.splitlines(keepends=True)]
 
 
 def _collect_last_occurrence_positions(
-    text_by_path: dict[Path, str],
+    parsed_by_path: dict[Path, list[ParsedLine]],
     ordered_files: list[ResolvedFile],
-) -> set[tuple[Path, int]]:
-    """Return positions for the last package occurrence per canonicalized name."""
+) -> dict[Path, frozenset[int]]:
+    """Return, per file, the line indices holding the last occurrence of each package."""
 
     last_positions: dict[str, tuple[Path, int]] = {}
     for resolved in ordered_files:
-        lines = text_by_path[resolved.path].splitlines(keepends=True)
-        for line_index, line in enumerate(lines):
-            parsed = parse_line(line)
-            if parsed.kind != "package" or not parsed.requirement:
+        for line_index, parsed in enumerate(parsed_by_path[resolved.path]):
+            if parsed.kind != "package" or parsed.canonical_name is None:
                 continue
-            canonical = canonicalize_name(parsed.requirement.name)
-            last_positions[canonical] = (resolved.path, line_index)
+            last_positions[parsed.canonical_name] = (resolved.path, line_index)
 
-    return set(last_positions.values())
+    indices_by_path: dict[Path, set[int]] = {resolved.path: set() for resolved in ordered_files}
+    for file_path, line_index in last_positions.values():
+        indices_by_path[file_path].add(line_index)
+    return {file_path: frozenset(indices) for file_path, indices in indices_by_path.items()}
+
+
+def _filtered_package_names(
+    parsed_lines: list[ParsedLine],
+    only: _PatternSet | None,
+    exclude: _PatternSet | None,
+) -> set[str]:
+    """Return the distinct package names in a file that pass only/exclude."""
+
+    names = {parsed.canonical_name for parsed in parsed_lines if parsed.canonical_name is not None}
+    # Canonical names are already lowercase, so no normcase is needed here.
+    if only is not None:
+        names = {name for name in names if only.matches(name)}
+    if exclude is not None:
+        names = {name for name in names if not exclude.matches(name)}
+    return names
 
 
 def _rewrite_text(
     path: Path,
     text: str,
+    parsed_lines: list[ParsedLine],
     installed: dict[str, str],
     options: Options,
     cap: CapStrategy | None,
-    writable_positions: set[tuple[Path, int]] | None,
-) -> tuple[str, list[Change]]:
-    lines = text.splitlines(keepends=True)
+    writable_positions: dict[Path, frozenset[int]] | None,
+    only: _PatternSet | None = None,
+    exclude: _PatternSet | None = None,
+) -> tuple[str, list[Change], list[str] | None]:
+    # Filters are evaluated once per distinct name; a file with no eligible
+    # package is returned untouched without walking its lines.
+    eligible = _filtered_package_names(parsed_lines, only, exclude)
+    if not eligible:
+        return text, [], None
+
     out_lines: list[str] = []
     changes: list[Change] = []
+    modified = False
+    # Looked up once so the per-line check never hashes a Path.
+    writable = writable_positions.get(path, frozenset()) if writable_positions is not None else None
+    policy, allow_prerelease, keep_local = options.policy, options.allow_prerelease, options.keep_local
 
-    for line_index, line in enumerate(lines):
-        parsed = parse_line(line)
+    for line_index, parsed in enumerate(parsed_lines):
+        line = parsed.original
 
-        if parsed.kind != "package" or not parsed.requirement:
+        if parsed.kind != "package" or not parsed.requirement or parsed.canonical_name is None:
             out_lines.append(line)
             continue
 
-        base_name = canonicalize_name(parsed.requirement.name)
+        base_name = parsed.canonical_name
 
-        if writable_positions is not None and (path, line_index) not in writable_positions:
+        if writable is not None and line_index not in writable:
             out_lines.append(line)
             continue
 
-        if _should_skip_pkg(base_name, tuple(options.only), tuple(options.exclude)):
+        if base_name not in eligible:
             out_lines.append(line)
             continue
 
@@ -135,9 +210,9 @@ def _rewrite_text(
         rewritten = apply_policy(
             req=parsed.requirement,
             installed_version=installed_version,
-            policy=options.policy,
-            allow_prerelease=options.allow_prerelease,
-            keep_local=options.keep_local,
+            policy=policy,
+            allow_prerelease=allow_prerelease,
+            keep_local=keep_local,
             cap_strategy=cap,
         )
 
@@ -157,11 +232,17 @@ def _rewrite_text(
                 )
             )
             out_lines.append(rewritten_line)
+            modified = True
             continue
 
         out_lines.append(line)
 
-    return "".join(out_lines), changes
+    # Unchanged files hand back the original object so callers' equality
+    # checks short-circuit on identity instead of comparing a rebuilt copy.
+    # Changed files also return their line list for make_diff to reuse.
+    if not modified:
+        return text, changes, None
+    return "".join(out_lines), changes, out_lines
 
 
 def _restore_backups(written_pairs: list[tuple[Path, Path]]) -> None:
@@ -192,55 +273,70 @@ def sync(options: Options) -> Result:
             if code != 0:
                 raise PipUpgradeFailedError()
 
-            if hasattr(get_installed_versions, "cache_clear"):
+            # importlib.metadata caches sys.path directory listings and only
+            # refreshes them on an mtime change, which coarse-mtime
+            # filesystems can miss right after pip rewrites site-packages.
+            importlib.invalidate_caches()
+            try:
                 get_installed_versions.cache_clear()
+            except AttributeError:  # monkeypatched shim without an lru_cache
+                pass
 
         installed = get_installed_versions()
-        resolved_files = _resolve_files(root, follow=options.follow_includes)
-
-        text_by_path: dict[Path, str] = {}
-        bom_by_path: dict[Path, bool] = {}
-        role_by_path: dict[Path, FileRole] = {}
-
-        for resolved in resolved_files:
-            text, _newline, bom = read_text_preserve(resolved.path)
-            guard_hashes(text.splitlines(), allow_hashes=options.allow_hashes)
-            text_by_path[resolved.path] = text
-            bom_by_path[resolved.path] = bom
-            role_by_path[resolved.path] = resolved.role
+        resolved_entries = _resolve_files(root, follow=options.follow_includes)
+        resolved_files = [resolved for resolved, _text, _bom in resolved_entries]
 
-        writable_positions: set[tuple[Path, int]] | None = None
+        cap_strategy = CapStrategy(default="next-major")
+        only_patterns = _compile_patterns(tuple(options.only))
+        exclude_patterns = _compile_patterns(tuple(options.exclude))
+        bom_by_path = {resolved.path: bom for resolved, _text, bom in resolved_entries}
+
+        # Last-wins needs every file parsed before any line can be rewritten;
+        # otherwise each file is guarded, parsed and rewritten in one pass.
+        parsed_by_path: dict[Path, list[ParsedLine]] = {}
+        writable_positions: dict[Path, frozenset[int]] | None = None
         if options.last_wins:
-            writable_positions = _collect_last_occurrence_positions(text_by_path, resolved_files)
+            for resolved, text, _bom in resolved_entries:
+                if resolved.role != "constraint" or options.update_constraints:
+                    guard_hashes(text, allow_hashes=options.allow_hashes)
+                parsed_by_path[resolved.path] = _parse_lines(text)
+            writable_positions = _collect_last_occurrence_positions(parsed_by_path, resolved_files)
 
-        cap_strategy = CapStrategy(default="next-major")
         file_results: list[FileChange] = []
-
-        for resolved in resolved_files:
-            original_text = text_by_path[resolved.path]
-            role = role_by_path[resolved.path]
-
-            if role == "constraint" and not options.update_constraints:
+        for resolved, text, _bom in resolved_entries:
+            if resolved.role == "constraint" and not options.update_constraints:
+                # Skipped constraint files are written back untouched, so they
+                # need neither the hash guard nor a parse of their own.
                 file_results.append(
-                    FileChange(file=resolved.path, role=role, original_text=original_text, new_text=original_text)
+                    FileChange(file=resolved.path, role=resolved.role, original_text=text, new_text=text)
                 )
                 continue
 
-            new_text, changes = _rewrite_text(
+            parsed_lines = parsed_by_path.get(resolved.path)
+            if parsed_lines is None:
+                guard_hashes(text, allow_hashes=options.allow_hashes)
+                parsed_lines = _parse_lines(text)
+
+            new_text, changes, new_lines = _rewrite_text(
                 path=resolved.path,
-                text=original_text,
+                text=text,
+                parsed_lines=parsed_lines,
                 installed=installed,
                 options=options,
                 cap=cap_strategy,
                 writable_positions=writable_positions,
+                only=only_patterns,
+                exclude=exclude_patterns,
             )
             file_results.append(
                 FileChange(
                     file=resolved.path,
-                    role=role,
-                    original_text=original_text,
+                    role=resolved.role,
+                    original_text=text,
                     new_text=new_text,
                     changes=changes,
+                    original_lines=None if new_lines is None else [parsed.original for parsed in parsed_lines],
+                    new_lines=new_lines,
                 )
             )
 
@@ -273,6 +369,12 @@ def sync(options: Options) -> Result:
                     write_text_preserve(file_result.file, file_result.new_text, bom=bom_by_path[file_result.file])
                     written_pairs.append((file_result.file, backup))
                 except Exception as exc:
+                    # The failed file was never replaced, so a hard-linked
+                    # backup would still alias it; give it its own inode.
+                    try:
+                        detach_backup(file_result.file, backup)
+                    except Exception:
+                        logging.warning("Unable to detach backup from original: %s", backup)
                     _restore_backups([*written_pairs, (file_result.file, backup)])
                     raise WriteRollbackError(str(exc)) from exc
 
@@ -20,20 +20,24 @@ from packaging.utils import canonicalize_name
 
 from .errors import DirtyRepoBlockedError, VenvBlockedError
 
-_ALLOWED_PIP_FLAGS: dict[str, bool] = {
-    "--index-url": True,
-    "--extra-index-url": True,
-    "--trusted-host": True,
-    "--find-links": True,
-    "--proxy": True,
-    "--retries": True,
-    "--timeout": True,
-    "--constraint": True,
-    "-c": True,
-    "--requirement": True,
-    "-r": True,
-    "--no-deps": False,
-}
+_canonicalize = lru_cache(maxsize=4096)(canonicalize_name)
+
+_FLAGS_WITH_VALUE = frozenset(
+    {
+        "--index-url",
+        "--extra-index-url",
+        "--trusted-host",
+        "--find-links",
+        "--proxy",
+        "--retries",
+        "--timeout",
+        "--constraint",
+        "-c",
+        "--requirement",
+        "-r",
+    }
+)
+_FLAGS_NO_VALUE = frozenset({"--no-deps"})
 
 
 def is_venv_active() -> bool:
@@ -82,22 +86,22 @@ def _allowlisted_pip_args(extra_args: str) -> list[str]:
         return []
 
     tokens = shlex.split(extra_args)
+    count = len(tokens)
     out: list[str] = []
     i = 0
-    while i < len(tokens):
+    while i < count:
         token = tokens[i]
         option, eq, _value = token.partition("=")
 
-        expects_value = _ALLOWED_PIP_FLAGS.get(option)
-        if expects_value is None:
-            if option.startswith("-") and not eq and i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+        if option in _FLAGS_WITH_VALUE:
+            out.append(token)
+            if not eq and i + 1 < count and not tokens[i + 1].startswith("-"):
+                out.append(tokens[i + 1])
                 i += 1
-            i += 1
-            continue
-
-        out.append(token)
-        if expects_value and not eq and i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
-            out.append(tokens[i + 1])
+        elif option in _FLAGS_NO_VALUE:
+            out.append(token)
+        elif option.startswith("-") and not eq and i + 1 < count and not tokens[i + 1].startswith("-"):
+            # Unknown flag: drop it together with its apparent value.
             i += 1
 
         i += 1
@@ -126,50 +130,63 @@ def run_pip_upgrade(requirements_path: str, timeout_sec: int, extra_args: str) -
     return proc.returncode, proc.stdout
 
 
-@lru_cache(maxsize=1)
-def get_installed_versions() -> dict[str, str]:
-    """Map canonicalized project name -> installed version from the current env."""
-
+def _installed_versions_from_metadata() -> dict[str, str]:
     try:
-        out = subprocess.check_output(
-            [sys.executable, "-m", "pip", "list", "--format=json"],
-            text=True,
-        )
-        data = json.loads(out)
-        versions: dict[str, str] = {}
-        for entry in data:
-            name = entry.get("name")
-            version = entry.get("version")
-            if not name or not version:
-                continue
-            versions[canonicalize_name(str(name))] = str(version)
-        return versions
-    except Exception:
-        try:
-            import importlib.metadata as importlib_metadata
-        except Exception:  # pragma: no cover - fallback for rare legacy setups
-            import importlib_metadata as importlib_metadata  # type: ignore
+        import importlib.metadata as importlib_metadata
+    except Exception:  # pragma: no cover - fallback for rare legacy setups
+        import importlib_metadata as importlib_metadata  # type: ignore
 
-        fallback: dict[str, str] = {}
-        for dist in importlib_metadata.distributions():
-            metadata = getattr(dist, "metadata", None)
-            raw_name: str | None = None
+    versions: dict[str, str] = {}
+    for dist in importlib_metadata.distributions():
+        metadata = getattr(dist, "metadata", None)
+        raw_name: str | None = None
 
-            if metadata is not None and hasattr(metadata, "get"):
-                try:
-                    raw_name = metadata.get("Name")
-                except Exception:
-                    raw_name = None
+        if metadata is not None and hasattr(metadata, "get"):
+            try:
+                raw_name = metadata.get("Name")
+            except Exception:
+                raw_name = None
+
+        if not raw_name:
+            raw_name = getattr(dist, "name", None) or getattr(dist, "project_name", None)
+
+        if not raw_name or not dist.version:
+            continue
 
-            if not raw_name:
-                raw_name = getattr(dist, "name", None) or getattr(dist, "project_name", None)
+        # Mirror pip's precedence: the first distribution found on sys.path wins.
+        versions.setdefault(_canonicalize(raw_name), dist.version)
 
-            if not raw_name:
-                continue
+    return versions
 
-            fallback[canonicalize_name(raw_name)] = dist.version
 
-        return fallback
+def _installed_versions_from_pip() -> dict[str, str]:
+    out = subprocess.check_output(
+        [sys.executable, "-m", "pip", "list", "--format=json"],
+        text=True,
+    )
+    data = json.loads(out)
+    versions: dict[str, str] = {}
+    for entry in data:
+        name = entry.get("name")
+        version = entry.get("version")
+        if not name or not version:
+            continue
+        versions[_canonicalize(str(name))] = str(version)
+    return versions
+
+
+@lru_cache(maxsize=1)
+def get_installed_versions() -> dict[str, str]:
+    """Map canonicalized project name -> installed version from the current env.
+
+    Reads distribution metadata in-process; the slower `pip list` subprocess is
+    only used if metadata inspection fails.
+    """
+
+    try:
+        return _installed_versions_from_metadata()
+    except Exception:
+        return _installed_versions_from_pip()
 
 
 __all__ = [
@@ -10,7 +10,10 @@ from __future__ import annotations
 import logging
 import os
 import shutil
+import stat
+import sys
 import tempfile
+import time
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -49,13 +52,83 @@ def write_text_preserve(path: Path, content: str, bom: bool) -> None:
     write_atomic_bytes(path, payload)
 
 
+_USE_O_TMPFILE = sys.platform.startswith("linux") and hasattr(os, "O_TMPFILE")
+
+
+def _target_mode(path: Path) -> int | None:
+    """Return the permission bits of an existing target, or None if missing."""
+
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return None
+
+
+def _write_atomic_anonymous(path: Path, data: bytes, mode: int | None) -> bool:
+    """Write via an unnamed O_TMPFILE inode; return False when unsupported."""
+
+    o_directory = getattr(os, "O_DIRECTORY", None)
+    o_tmpfile = getattr(os, "O_TMPFILE", None)
+    if o_directory is None or o_tmpfile is None:
+        return False
+
+    try:
+        dir_fd = os.open(str(path.parent), os.O_RDONLY | o_directory)
+    except OSError:
+        return False
+
+    try:
+        try:
+            fd = os.open(".", o_tmpfile | os.O_WRONLY, 0o644, dir_fd=dir_fd)
+        except OSError:
+            return False
+
+        # The inode only gets a name once fully written, so a crash mid-write
+        # leaves no partial file behind. A crash between the link and the
+        # rename below can still leave a complete reqsync-*.tmp file.
+        tmp_name = f"reqsync-{os.getpid()}-{time.monotonic_ns()}.tmp"
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            if mode is not None:
+                os.fchmod(fd, mode)
+            # Passing a dir_fd makes CPython use linkat(AT_SYMLINK_FOLLOW),
+            # which is what resolves the /proc fd link to the inode.
+            os.link(f"/proc/self/fd/{fd}", tmp_name, dst_dir_fd=dir_fd)
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+        try:
+            os.replace(tmp_name, path.name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except Exception:
+            try:
+                os.unlink(tmp_name, dir_fd=dir_fd)
+            except Exception:
+                pass
+            raise
+        return True
+    finally:
+        os.close(dir_fd)
+
+
 def write_atomic_bytes(path: Path, data: bytes) -> None:
     """Atomically replace file content with a temp-file swap."""
 
+    # Both paths carry the target's permission bits over to the new inode.
+    mode = _target_mode(path)
+    if _USE_O_TMPFILE and _write_atomic_anonymous(path, data, mode):
+        return
+
     tmp_fd, tmp_path = tempfile.mkstemp(prefix="reqsync-", suffix=".tmp", dir=str(path.parent))
     try:
         with os.fdopen(tmp_fd, "wb") as stream:
             stream.write(data)
+        # os.chmod rather than fchmod: this path also serves Windows.
+        if mode is not None:
+            os.chmod(tmp_path, mode)
         os.replace(tmp_path, path)
     except Exception:
         try:
@@ -71,11 +144,19 @@ def _prune_old_backups(path: Path, suffix: str, keep_last: int) -> None:
     if keep_last <= 0:
         return
 
-    pattern = f"{path.name}{suffix}.*"
-    backups = sorted(path.parent.glob(pattern), key=lambda item: item.stat().st_mtime, reverse=True)
-    for stale in backups[keep_last:]:
+    # One directory scan; DirEntry.stat() reuses readdir data where the OS
+    # provides it instead of a separate stat() per backup.
+    prefix = f"{path.name}{suffix}."
+    backups: list[tuple[float, str, str]] = []
+    with os.scandir(path.parent) as entries:
+        for entry in entries:
+            if entry.name.startswith(prefix):
+                backups.append((entry.stat().st_mtime, entry.name, entry.path))
+
+    backups.sort(reverse=True)
+    for _mtime, _name, stale in backups[keep_last:]:
         try:
-            stale.unlink()
+            os.unlink(stale)
         except OSError:
             logging.warning("Unable to prune old backup: %s", stale)
 
@@ -96,7 +177,14 @@ def _build_unique_timestamped_backup_path(path: Path, suffix: str) -> Path:
 
 
 def backup_file(path: Path, suffix: str, timestamped: bool, keep_last: int) -> Path:
-    """Create a backup copy and return its path."""
+    """Create a backup of path and return the backup path.
+
+    The backup may be a hard link that shares its inode with path until path
+    is replaced atomically. Writing to path in place before then (for example
+    with Path.write_text) changes the backup too. Replace the original with
+    write_text_preserve or write_atomic_bytes instead, and call detach_backup
+    if that replacement fails.
+    """
 
     if not path.exists():
         raise FileNotFoundError(f"Cannot back up missing file: {path}")
@@ -106,13 +194,48 @@ def backup_file(path: Path, suffix: str, timestamped: bool, keep_last: int) -> P
     else:
         backup = path.with_name(f"{path.name}{suffix}")
 
-    shutil.copy2(path, backup)
+    # A hard link snapshots the current inode without copying bytes. This is
+    # safe because reqsync rewrites files via write_atomic_bytes, whose
+    # os.replace swaps in a new inode and leaves the linked backup untouched.
+    # Cross-device targets or filesystems without links fall back to a copy.
+    try:
+        if backup.exists():
+            backup.unlink()
+        os.link(path, backup)
+    except OSError:
+        shutil.copy2(path, backup)
     if timestamped:
         _prune_old_backups(path=path, suffix=suffix, keep_last=keep_last)
     logging.info("Backed up to: %s", backup)
     return backup
 
 
+def detach_backup(path: Path, backup: Path) -> None:
+    """Replace a backup that is still hard-linked to path with its own copy.
+
+    Call this when a write fails before swapping in a new inode; otherwise the
+    backup would keep tracking any later in-place edit of the original.
+    """
+
+    try:
+        if not os.path.samefile(path, backup):
+            return
+    except OSError:
+        return
+
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="reqsync-", suffix=".tmp", dir=str(backup.parent))
+    os.close(tmp_fd)
+    try:
+        shutil.copy2(path, tmp_path)
+        os.replace(tmp_path, backup)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except Exception:
+            pass
+        raise
+
+
 @contextmanager
 def advisory_lock(lock_path: Path, timeout_sec: int):
     """Acquire an advisory file lock when portalocker is available."""
@@ -134,6 +257,7 @@ def advisory_lock(lock_path: Path, timeout_sec: int):
 __all__ = [
     "advisory_lock",
     "backup_file",
+    "detach_backup",
     "read_text_preserve",
     "write_atomic_bytes",
     "write_text_preserve",
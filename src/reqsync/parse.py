@@ -11,30 +11,49 @@ import logging
 import re
 from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal
 
 from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
 
 from .errors import HashPinsPresentError
 
-PIP_DIRECTIVE_PREFIXES = (
-    "-r",
-    "--requirement",
-    "-c",
-    "--constraint",
-    "-e",
-    "--editable",
-    "--index-url",
-    "--extra-index-url",
-    "--find-links",
-    "--trusted-host",
-    "--no-index",
+PIP_DIRECTIVE_PREFIXES = frozenset(
+    {
+        "-r",
+        "--requirement",
+        "-c",
+        "--constraint",
+        "-e",
+        "--editable",
+        "--index-url",
+        "--extra-index-url",
+        "--find-links",
+        "--trusted-host",
+        "--no-index",
+    }
 )
 
+_canonicalize = lru_cache(maxsize=4096)(canonicalize_name)
+
 VCS_OR_URL_RE = re.compile(r"^\s*(git\+|https?://|ssh://|file:|svn\+|hg\+|bzr\+)", re.IGNORECASE)
 LOCAL_PATH_RE = re.compile(r"^\s*(\.\.?/|/|[a-zA-Z]:\\)")
 INCLUDE_RE = re.compile(r"^\s*(-r|--requirement)\s+(.+)$", re.IGNORECASE)
 CONSTRAINT_RE = re.compile(r"^\s*(-c|--constraint)\s+(.+)$", re.IGNORECASE)
+_LINK_RE = re.compile(
+    r"^\s*(?:(?P<req>-r|--requirement)|(?P<con>-c|--constraint))\s+(?P<path>.+)$",
+    re.IGNORECASE,
+)
+_FIRST_TOKEN_RE = re.compile(r"\S+")
+# Editable, VCS/URL and local-path prefixes in one anchored pass. Hash pins
+# are checked first (they can appear anywhere on a line) and directives after,
+# which is safe because none of these prefixes start a directive token.
+_CLASSIFY_RE = re.compile(
+    r"(?P<editable>-e|--editable)"
+    r"|(?P<vcs>(?i:git\+|https?://|ssh://|file:|svn\+|hg\+|bzr\+))"
+    r"|(?P<path>\.\.?/|/|[a-zA-Z]:\\)"
+)
 
 
 @dataclass(frozen=True)
@@ -55,6 +74,7 @@ class ParsedLine:
     eol: str
     requirement: Requirement | None
     kind: str
+    canonical_name: str | None = None
 
 
 def is_pip_directive(stripped: str) -> bool:
@@ -62,8 +82,11 @@ def is_pip_directive(stripped: str) -> bool:
 
     if not stripped or stripped.startswith("#"):
         return True
-    token = stripped.split()[0]
-    if token.startswith("--") and token not in {"--hash"}:
+    match = _FIRST_TOKEN_RE.search(stripped)
+    if match is None:
+        return True
+    token = match.group()
+    if token.startswith("--") and token != "--hash":
         return True
     return token in PIP_DIRECTIVE_PREFIXES
 
@@ -71,35 +94,48 @@ def is_pip_directive(stripped: str) -> bool:
 def split_trailing_comment(raw_no_eol: str) -> tuple[str, str]:
     """Split inline comments while preserving URLs containing '#'."""
 
-    parts = raw_no_eol.split(" #", 1)
-    if len(parts) == 2:
-        return parts[0].rstrip(), " #" + parts[1]
-    return raw_no_eol.rstrip(), ""
+    index = raw_no_eol.find(" #")
+    if index == -1:
+        return raw_no_eol.rstrip(), ""
+    return raw_no_eol[:index].rstrip(), raw_no_eol[index:]
+
 
+def guard_hashes(lines: str | Iterable[str], allow_hashes: bool) -> None:
+    """Fail fast when hash-pinned stanzas are present and not allowed.
 
-def guard_hashes(lines: Iterable[str], allow_hashes: bool) -> None:
-    """Fail fast when hash-pinned stanzas are present and not allowed."""
+    Accepts a whole file's text or its lines; text and line lists are checked
+    with one C-level substring scan, other iterables line by line.
+    """
 
     if allow_hashes:
         return
+    if isinstance(lines, (list, tuple)):
+        lines = "\n".join(lines)
+    if isinstance(lines, str):
+        if "--hash=" in lines:
+            raise HashPinsPresentError()
+        return
     for line in lines:
         if "--hash=" in line:
             raise HashPinsPresentError()
 
 
 def _split_eol(line: str) -> tuple[str, str]:
-    if line.endswith("\r\n"):
-        return line[:-2], "\r\n"
-    if line.endswith("\n"):
+    # Dispatch on the last character once; "\n" endings are the common case.
+    if not line:
+        return "", ""
+    last = line[-1]
+    if last == "\n":
+        if line[-2:-1] == "\r":
+            return line[:-2], "\r\n"
         return line[:-1], "\n"
-    if line.endswith("\r"):
+    if last == "\r":
         return line[:-1], "\r"
     return line, ""
 
 
-def parse_line(line: str) -> ParsedLine:
-    """Parse one raw requirement line preserving trailing comment and eol."""
-
+@lru_cache(maxsize=4096)
+def _parse_line_cached(line: str) -> ParsedLine:
     raw, eol = _split_eol(line)
     stripped = raw.strip()
 
@@ -107,23 +143,38 @@ def parse_line(line: str) -> ParsedLine:
         return ParsedLine(line, None, "", eol, None, "comment")
     if "--hash=" in stripped:
         return ParsedLine(line, None, "", eol, None, "hashed")
-    if stripped.startswith(("-e", "--editable")):
-        return ParsedLine(line, None, "", eol, None, "editable")
+    classified = _CLASSIFY_RE.match(stripped)
+    if classified is not None:
+        return ParsedLine(line, None, "", eol, None, classified.lastgroup or "unparsed")
     if is_pip_directive(stripped):
         return ParsedLine(line, None, "", eol, None, "directive")
-    if VCS_OR_URL_RE.match(stripped):
-        return ParsedLine(line, None, "", eol, None, "vcs")
-    if LOCAL_PATH_RE.match(stripped):
-        return ParsedLine(line, None, "", eol, None, "path")
 
     content, comment = split_trailing_comment(raw)
     try:
-        return ParsedLine(line, content, comment, eol, Requirement(content), "package")
+        requirement = Requirement(content)
+        return ParsedLine(line, content, comment, eol, requirement, "package", _canonicalize(requirement.name))
     except Exception:
-        logging.warning("Unparseable requirement kept as-is: %s", stripped)
         return ParsedLine(line, None, "", eol, None, "unparsed")
 
 
+def parse_line(line: str) -> ParsedLine:
+    """Parse one raw requirement line preserving trailing comment and eol."""
+
+    # Results are memoized per raw line (ParsedLine is frozen and Requirement
+    # is never mutated downstream); the warning stays outside the cache so it
+    # still fires on every run.
+    parsed = _parse_line_cached(line)
+    if parsed.kind == "unparsed":
+        logging.warning("Unparseable requirement kept as-is: %s", line.strip())
+    return parsed
+
+
+def invalidate_parse_cache() -> None:
+    """Drop memoized parse_line results."""
+
+    _parse_line_cached.cache_clear()
+
+
 def _extract_link_path(raw_value: str) -> str:
     value, _comment = split_trailing_comment(raw_value)
     value = value.strip().strip('"').strip("'")
@@ -135,29 +186,37 @@ def find_file_links(lines: Iterable[str]) -> list[IncludeRef]:
 
     refs: list[IncludeRef] = []
     for line in lines:
-        stripped = line.strip()
-        include_match = INCLUDE_RE.match(stripped)
-        if include_match:
-            refs.append(IncludeRef(path=_extract_link_path(include_match.group(2)), kind="requirement"))
+        # The leading \s* and _extract_link_path's own strip make line.strip()
+        # unnecessary here.
+        link_match = _LINK_RE.match(line)
+        if link_match is None:
             continue
-
-        constraint_match = CONSTRAINT_RE.match(stripped)
-        if constraint_match:
-            refs.append(IncludeRef(path=_extract_link_path(constraint_match.group(2)), kind="constraint"))
+        kind: Literal["requirement", "constraint"] = "requirement" if link_match.group("req") else "constraint"
+        refs.append(IncludeRef(path=_extract_link_path(link_match.group("path")), kind=kind))
 
     return refs
 
 
+def find_file_links_split(lines: Iterable[str]) -> tuple[list[str], list[str]]:
+    """Return (include paths, constraint paths) from a single scan."""
+
+    includes: list[str] = []
+    constraints: list[str] = []
+    for ref in find_file_links(lines):
+        (includes if ref.kind == "requirement" else constraints).append(ref.path)
+    return includes, constraints
+
+
 def find_includes(lines: Iterable[str]) -> list[str]:
     """Compatibility helper returning include paths only."""
 
-    return [ref.path for ref in find_file_links(lines) if ref.kind == "requirement"]
+    return find_file_links_split(lines)[0]
 
 
 def find_constraints(lines: Iterable[str]) -> list[str]:
     """Compatibility helper returning constraint paths only."""
 
-    return [ref.path for ref in find_file_links(lines) if ref.kind == "constraint"]
+    return find_file_links_split(lines)[1]
 
 
 __all__ = [
@@ -165,8 +224,10 @@ __all__ = [
     "ParsedLine",
     "find_constraints",
     "find_file_links",
+    "find_file_links_split",
     "find_includes",
     "guard_hashes",
+    "invalidate_parse_cache",
     "is_pip_directive",
     "parse_line",
     "split_trailing_comment",
@@ -8,6 +8,7 @@ into a rewritten requirement string according to selected floor/cap semantics.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from packaging.requirements import Requirement
 from packaging.version import Version
@@ -28,6 +29,11 @@ class CapStrategy:
         return self.default
 
 
+# Installed versions repeat across every pin of a package; Version() parsing
+# is regex-heavy and the result is immutable.
+_parse_version = lru_cache(maxsize=4096)(Version)
+
+
 def _next_major(version: Version) -> str:
     return f"{version.major + 1}.0.0"
 
@@ -36,44 +42,61 @@ def _next_minor(version: Version) -> str:
     return f"{version.major}.{version.minor + 1}.0"
 
 
-def _build_base_requirement(req: Requirement) -> str:
-    output = req.name
-    if req.extras:
-        output += "[" + ",".join(sorted(req.extras)) + "]"
-    return output
+def _build_base_requirement(name: str, extras: tuple[str, ...]) -> str:
+    if not extras:
+        return name
+    return f"{name}[{','.join(extras)}]"
 
 
-_FLOOR_OPERATORS = {">=", ">", "~=", "=="}
+def _sorted_extras(extras: set[str]) -> tuple[str, ...]:
+    # Most requirements have no extras, and one extra needs no sort.
+    if not extras:
+        return ()
+    if len(extras) == 1:
+        return tuple(extras)
+    return tuple(sorted(extras))
 
 
-def _with_floor_preserving_non_floor(req: Requirement, floor_version: str, require_existing_floor: bool) -> str | None:
+# Tuples rather than sets: with four short operator strings a linear compare
+# beats hashing on every specifier.
+_FLOOR_OPERATORS = (">=", ">", "~=", "==")
+_IN_PLACE_OPERATORS = (">=", "~=", "==")
+
+
+def _with_floor_preserving_non_floor(
+    specifiers: tuple[tuple[str, str], ...], floor_version: str, require_existing_floor: bool
+) -> str | None:
     """Return specifiers with an updated floor and preserved non-floor constraints."""
 
     preserved: list[str] = []
     has_existing_floor = False
-    for item in req.specifier:
-        if item.operator in _FLOOR_OPERATORS:
+    for operator, rendered in specifiers:
+        if operator in _FLOOR_OPERATORS:
             has_existing_floor = True
             continue
-        preserved.append(str(item))
+        preserved.append(rendered)
 
     if require_existing_floor and not has_existing_floor:
         return None
 
-    return ",".join([f">={floor_version}", *preserved])
+    if not preserved:
+        return f">={floor_version}"
+    return f">={floor_version}," + ",".join(preserved)
 
 
-def apply_policy(
-    req: Requirement,
+@lru_cache(maxsize=2048)
+def _apply_policy_cached(
+    name: str,
+    extras: tuple[str, ...],
+    specifiers: tuple[tuple[str, str], ...],
+    marker: str,
     installed_version: str,
     policy: Policy,
     allow_prerelease: bool,
     keep_local: bool,
-    cap_strategy: CapStrategy | None = None,
+    cap: str,
 ) -> str | None:
-    """Return a rewritten requirement line content or None for no-op."""
-
-    parsed = Version(installed_version)
+    parsed = _parse_version(installed_version)
 
     if (parsed.is_prerelease or parsed.is_devrelease) and not allow_prerelease:
         return None
@@ -81,43 +104,71 @@ def apply_policy(
     floor_version = installed_version if (parsed.local and keep_local) else parsed.public
 
     if policy == "update-in-place":
-        if not req.specifier:
+        if not specifiers:
             spec = f">={floor_version}"
         else:
             updated = False
             spec_parts: list[str] = []
-            for item in req.specifier:
-                if item.operator in {">=", "~=", "=="}:
-                    spec_parts.append(f"{item.operator}{floor_version}")
+            for operator, rendered in specifiers:
+                if operator in _IN_PLACE_OPERATORS:
+                    spec_parts.append(f"{operator}{floor_version}")
                     updated = True
                 else:
-                    spec_parts.append(str(item))
+                    spec_parts.append(rendered)
             if not updated:
                 spec_parts.append(f">={floor_version}")
             spec = ",".join(spec_parts)
     elif policy == "lower-bound":
-        maybe_spec = _with_floor_preserving_non_floor(req, floor_version, require_existing_floor=False)
+        maybe_spec = _with_floor_preserving_non_floor(specifiers, floor_version, require_existing_floor=False)
         if maybe_spec is None:
             return None
         spec = maybe_spec
     elif policy == "floor-only":
-        maybe_spec = _with_floor_preserving_non_floor(req, floor_version, require_existing_floor=True)
+        maybe_spec = _with_floor_preserving_non_floor(specifiers, floor_version, require_existing_floor=True)
         if maybe_spec is None:
             return None
         spec = maybe_spec
     elif policy == "floor-and-cap":
-        strategy = cap_strategy.for_package(req.name) if cap_strategy else "next-major"
-        upper = _next_major(parsed) if strategy == "next-major" else _next_minor(parsed)
+        upper = _next_major(parsed) if cap == "next-major" else _next_minor(parsed)
         spec = f">={floor_version},<{upper}"
     else:
         spec = f">={floor_version}"
 
-    output = _build_base_requirement(req)
+    output = _build_base_requirement(name, extras)
     if spec:
         output += spec
-    if req.marker:
-        output += f"; {req.marker}"
+    if marker:
+        output += f"; {marker}"
     return output
 
 
+def apply_policy(
+    req: Requirement,
+    installed_version: str,
+    policy: Policy,
+    allow_prerelease: bool,
+    keep_local: bool,
+    cap_strategy: CapStrategy | None = None,
+) -> str | None:
+    """Return a rewritten requirement line content or None for no-op."""
+
+    # The result depends only on these hashable parts of the requirement, so
+    # repeated pins across files and runs are computed once. The cap strategy
+    # is resolved here because CapStrategy itself holds an unhashable dict.
+    cap = ""
+    if policy == "floor-and-cap":
+        cap = cap_strategy.for_package(req.name) if cap_strategy else "next-major"
+    return _apply_policy_cached(
+        req.name,
+        _sorted_extras(req.extras),
+        tuple((item.operator, str(item)) for item in req.specifier),
+        str(req.marker) if req.marker else "",
+        installed_version,
+        policy,
+        allow_prerelease,
+        keep_local,
+        cap,
+    )
+
+
 __all__ = ["CapStrategy", "apply_policy"]
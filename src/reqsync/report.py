@@ -8,27 +8,63 @@ by the CLI, Python API, and MCP server integrations.
 from __future__ import annotations
 
 import difflib
+import importlib
+import io
 import json
 from pathlib import Path
+from typing import Any, cast
 
 from ._types import Change, FileChange, JsonChange, JsonFileResult, JsonResult, Result
 
+orjson: Any
+try:
+    orjson = importlib.import_module("orjson")
+except Exception:  # pragma: no cover - optional speedup dependency
+    orjson = None
+
+
+def dumps_json(payload: Any, pretty: bool = True) -> str:
+    """Serialize a JSON payload, via orjson when installed.
+
+    ``pretty`` uses 2-space indentation; otherwise output is compact.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return cast(str, orjson.dumps(payload, option=option).decode("utf-8"))
+    if pretty:
+        return json.dumps(payload, indent=2)
+    return json.dumps(payload, separators=(",", ":"))
+
 
 def make_diff(files: list[FileChange]) -> str:
     """Build a unified diff for files that actually changed."""
 
-    chunks: list[str] = []
+    # Diff lines stream into one buffer; a blank line separates files.
+    buffer = io.StringIO()
     for file_change in files:
         if file_change.original_text == file_change.new_text:
             continue
+        original_lines = file_change.original_lines
+        if original_lines is None:
+            original_lines = file_change.original_text.splitlines(keepends=True)
+        new_lines = file_change.new_lines
+        if new_lines is None:
+            new_lines = file_change.new_text.splitlines(keepends=True)
         diff = difflib.unified_diff(
-            file_change.original_text.splitlines(keepends=True),
-            file_change.new_text.splitlines(keepends=True),
+            original_lines,
+            new_lines,
             fromfile=f"{file_change.file} (old)",
             tofile=f"{file_change.file} (new)",
         )
-        chunks.append("".join(diff))
-    return "\n".join(chunk for chunk in chunks if chunk)
+        first = True
+        for line in diff:
+            if first:
+                if buffer.tell():
+                    buffer.write("\n")
+                first = False
+            buffer.write(line)
+    return buffer.getvalue()
 
 
 def summarize_changes(changes: list[Change]) -> str:
@@ -46,15 +82,22 @@ def to_json_report(files: list[FileChange]) -> JsonResult:
     file_rows: list[JsonFileResult] = []
     change_rows: list[JsonChange] = []
 
+    any_changed = False
+
     for file_change in files:
+        changed = file_change.original_text != file_change.new_text
+        any_changed = any_changed or changed
         file_rows.append(
             {
                 "file": str(file_change.file),
                 "role": file_change.role,
-                "changed": file_change.original_text != file_change.new_text,
+                "changed": changed,
                 "change_count": len(file_change.changes),
             }
         )
+        if not changed:
+            # Change entries are only recorded for lines that were rewritten.
+            continue
         for change in file_change.changes:
             change_rows.append(
                 {
@@ -67,7 +110,7 @@ def to_json_report(files: list[FileChange]) -> JsonResult:
             )
 
     return {
-        "changed": any(row["changed"] for row in file_rows),
+        "changed": any_changed,
         "files": file_rows,
         "changes": change_rows,
         "backup_paths": [],
@@ -85,8 +128,11 @@ def result_to_json(result: Result) -> JsonResult:
     return report
 
 
-def write_json_report(report: JsonResult, path: str) -> Path:
-    """Write JSON report to file path and return resolved output path."""
+def write_json_report(report: JsonResult, path: str, pretty: bool = True) -> Path:
+    """Write JSON report to file path and return resolved output path.
+
+    Reports are indented by default; pass ``pretty=False`` for compact output.
+    """
 
     target = Path(path)
     if target.exists() and target.is_dir():
@@ -96,11 +142,12 @@ def write_json_report(report: JsonResult, path: str) -> Path:
 
     target.parent.mkdir(parents=True, exist_ok=True)
     with target.open("w", encoding="utf-8") as stream:
-        json.dump(report, stream, indent=2)
+        stream.write(dumps_json(report, pretty=pretty))
     return target
 
 
 __all__ = [
+    "dumps_json",
     "make_diff",
     "result_to_json",
     "summarize_changes",
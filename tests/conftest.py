@@ -1,15 +1,24 @@
 # ./tests/conftest.py
 """Pytest session setup for reqsync.
 
-Ensures the local `src/` package is importable during test runs and scrubs
-`__pycache__` directories before collection so tests always execute fresh code.
+Ensures the local `src/` package is importable during test runs. Set
+`REQSYNC_SCRUB_PYCACHE=1` to scrub `__pycache__` directories before collection;
+by default the bytecode cache is kept so repeated runs skip recompilation.
 """
 
 from __future__ import annotations
 
+import importlib
+import os
 import shutil
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import pytest
+
+if TYPE_CHECKING:
+    from typer.testing import CliRunner
 
 
 def _scrub_pycache(root: Path) -> None:
@@ -22,4 +31,48 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-_scrub_pycache(PROJECT_ROOT)
+if os.environ.get("REQSYNC_SCRUB_PYCACHE"):
+    _scrub_pycache(PROJECT_ROOT)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Import reqsync modules before collection so no test pays first-import cost."""
+
+    # reqsync.cli builds the Typer app at import time; reqsync's package
+    # exports are lazy, so the engine modules are imported explicitly.
+    for module in ("cli", "config", "core", "env", "io", "parse", "policy", "report"):
+        importlib.import_module(f"reqsync.{module}")
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """One Typer CliRunner shared by every CLI test; invoke() isolates streams per call."""
+
+    from typer.testing import CliRunner
+
+    return CliRunner()
+
+
+_CORE_STUBBED = ("ensure_venv_or_exit", "ensure_git_clean_or_exit", "run_pip_upgrade", "get_installed_versions")
+
+
+@pytest.fixture
+def stub_sync_env() -> Iterator[Callable[[dict[str, str]], None]]:
+    """Bypass venv/git/pip side effects in core and let a test set installed versions."""
+
+    from reqsync import core as core_mod
+
+    # Plain attribute swaps restored on teardown; cheaper than monkeypatch.
+    saved = {name: getattr(core_mod, name) for name in _CORE_STUBBED}
+    core_mod.ensure_venv_or_exit = lambda *_args, **_kwargs: None
+    core_mod.ensure_git_clean_or_exit = lambda *_args, **_kwargs: None
+    core_mod.run_pip_upgrade = lambda *_args, **_kwargs: (0, "skipped")
+
+    def set_installed(versions: dict[str, str]) -> None:
+        core_mod.get_installed_versions = lambda: versions
+
+    try:
+        yield set_installed
+    finally:
+        for name, value in saved.items():
+            setattr(core_mod, name, value)
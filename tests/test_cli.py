@@ -11,48 +11,52 @@ import inspect
 import textwrap
 from pathlib import Path
 
-from typer.testing import CliRunner
+import pytest
 
 from reqsync import cli as cli_mod
-from reqsync import core as core_mod
 from reqsync._types import ExitCode
 from reqsync.cli import app
 
-runner = CliRunner()
-
 
 def _write(path: Path, content: str) -> Path:
-    text = textwrap.dedent(content).lstrip("\n")
+    # Single-line literals are already flush-left; only blocks need dedent.
+    text = content if content.count("\n") <= 1 else textwrap.dedent(content).lstrip("\n")
     path.write_text(text, encoding="utf-8")
     return path
 
 
-def test_cli_missing_file_returns_clear_exit_code(tmp_path: Path) -> None:
-    missing = tmp_path / "missing.txt"
-    result = runner.invoke(app, ["run", "--path", str(missing), "--system-ok", "--no-upgrade", "--no-use-config"])
-    assert result.exit_code == int(ExitCode.MISSING_FILE)
+@pytest.fixture(scope="module")
+def readonly_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Scaffolding shared by tests that never modify their requirement files."""
 
-
-def test_cli_refuses_hashed_requirements_with_helpful_message(tmp_path: Path) -> None:
-    req = _write(
-        tmp_path / "requirements.txt",
+    root = tmp_path_factory.mktemp("reqsync_cli")
+    _write(
+        root / "hashed.txt",
         """
         requests==2.32.3 \\
             --hash=sha256:deadbeefdeadbeefdeadbeefdeadbeefdeadbeefdeadbeefdeadbeefdeadbeef
         """,
     )
+    return root
+
+
+def test_cli_missing_file_returns_clear_exit_code(readonly_dir: Path, runner) -> None:
+    missing = readonly_dir / "missing.txt"
+    result = runner.invoke(app, ["run", "--path", str(missing), "--system-ok", "--no-upgrade", "--no-use-config"])
+    assert result.exit_code == int(ExitCode.MISSING_FILE)
+
+
+def test_cli_refuses_hashed_requirements_with_helpful_message(readonly_dir: Path, runner) -> None:
+    req = readonly_dir / "hashed.txt"
     result = runner.invoke(app, ["run", "--path", str(req), "--system-ok", "--no-upgrade", "--no-use-config"])
     assert result.exit_code == int(ExitCode.HASHES_PRESENT)
     assert "hash" in result.output.lower()
 
 
-def test_cli_dry_run_and_check_exit_codes(tmp_path: Path, monkeypatch) -> None:
+def test_cli_dry_run_and_check_exit_codes(tmp_path: Path, stub_sync_env, runner) -> None:
     req = _write(tmp_path / "requirements.txt", "pandas>=1.0.0\n")
 
-    core_mod.get_installed_versions.cache_clear()
-    monkeypatch.setattr(core_mod, "get_installed_versions", lambda: {"pandas": "2.2.2"})
-    monkeypatch.setattr(core_mod, "ensure_venv_or_exit", lambda _system_ok: None)
-    monkeypatch.setattr(core_mod, "ensure_git_clean_or_exit", lambda _repo_root, _allow_dirty: None)
+    stub_sync_env({"pandas": "2.2.2"})
 
     dry_result = runner.invoke(
         app,
@@ -69,7 +73,7 @@ def test_cli_dry_run_and_check_exit_codes(tmp_path: Path, monkeypatch) -> None:
     assert "pandas>=2.2.2" in check_result.output
 
 
-def test_subcommand_help_lists_other_available_commands() -> None:
+def test_subcommand_help_lists_other_available_commands(runner) -> None:
     for command in ("run", "version", "mcp"):
         result = runner.invoke(app, [command, "--help"])
         assert result.exit_code == 0
@@ -81,7 +85,7 @@ def test_subcommand_help_lists_other_available_commands() -> None:
         assert "reqsync mcp" in normalized
 
 
-def test_help_command_includes_discoverability_guidance() -> None:
+def test_help_command_includes_discoverability_guidance(runner) -> None:
     result = runner.invoke(app, ["help", "all"])
     assert result.exit_code == 0
     normalized = " ".join(result.output.split())
@@ -90,7 +94,7 @@ def test_help_command_includes_discoverability_guidance() -> None:
     assert "reqsync help [all|run|version|mcp]" in normalized
 
 
-def test_cli_version_option_prints_version() -> None:
+def test_cli_version_option_prints_version(runner) -> None:
     result = runner.invoke(app, ["--version"])
     assert result.exit_code == 0
     assert result.output.startswith("reqsync ")
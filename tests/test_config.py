@@ -0,0 +1,104 @@
+# ./tests/test_config.py
+"""Project config loading tests.
+
+Covers memoized config reads so repeated programmatic runs stay cheap while
+still picking up edits to reqsync.toml / pyproject.toml / reqsync.json.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from reqsync import config as config_mod
+from reqsync._types import Options
+from reqsync.config import invalidate_config_cache, load_project_config, merge_options
+
+
+def test_load_project_config_reuses_cache_until_files_change(tmp_path: Path, monkeypatch) -> None:
+    invalidate_config_cache()
+    cfg = tmp_path / "reqsync.toml"
+    cfg.write_text('policy = "floor-only"\n', encoding="utf-8")
+
+    calls: list[Path] = []
+    original = config_mod._load_config_file
+
+    def counting_load(path: Path) -> dict:
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(config_mod, "_load_config_file", counting_load)
+
+    first = load_project_config(tmp_path)
+    first["policy"] = "mutated-by-caller"
+    second = load_project_config(tmp_path)
+    assert second == {"policy": "floor-only"}
+    assert len(calls) == 1
+
+    cfg.write_text('policy = "floor-and-cap"\n', encoding="utf-8")
+    stat = cfg.stat()
+    os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_project_config(tmp_path) == {"policy": "floor-and-cap"}
+    assert len(calls) == 2
+
+
+def test_merge_options_coerces_loose_values_and_keeps_base_for_missing_keys() -> None:
+    base = Options(path=Path("requirements.txt"), pip_timeout_sec=30)
+    merged = merge_options(
+        base,
+        {
+            "path": "requirements/base.txt",
+            "only": "pandas, numpy*",
+            "policy": "not-a-policy",
+            "dry_run": "yes",
+            "backup_keep_last": -3,
+            "json_report": "",
+        },
+    )
+
+    assert merged.path == Path("requirements/base.txt")
+    assert tuple(merged.only) == ("pandas", "numpy*")
+    assert merged.policy == "lower-bound"
+    assert merged.dry_run is True
+    assert merged.backup_keep_last == 0
+    assert merged.json_report is None
+    assert merged.pip_timeout_sec == 30
+
+
+def test_parallel_config_read_keeps_file_precedence(tmp_path: Path, monkeypatch) -> None:
+    invalidate_config_cache()
+    (tmp_path / "reqsync.toml").write_text('policy = "floor-only"\ndry_run = true\n', encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text('[tool.reqsync]\npolicy = "floor-and-cap"\n', encoding="utf-8")
+    (tmp_path / "reqsync.json").write_text('{"show_diff": true}', encoding="utf-8")
+
+    sequential = load_project_config(tmp_path)
+    invalidate_config_cache()
+    monkeypatch.setenv("REQSYNC_PARALLEL_CONFIG", "1")
+    parallel = load_project_config(tmp_path)
+
+    assert parallel == sequential == {"policy": "floor-and-cap", "dry_run": True, "show_diff": True}
+
+
+def test_editing_one_config_file_reparses_only_that_file(tmp_path: Path, monkeypatch) -> None:
+    invalidate_config_cache()
+    toml_cfg = tmp_path / "reqsync.toml"
+    json_cfg = tmp_path / "reqsync.json"
+    toml_cfg.write_text('policy = "floor-only"\n', encoding="utf-8")
+    json_cfg.write_text('{"show_diff": true}', encoding="utf-8")
+
+    calls: list[str] = []
+    original = config_mod._load_config_file
+
+    def counting_load(path: Path) -> dict:
+        calls.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(config_mod, "_load_config_file", counting_load)
+
+    load_project_config(tmp_path)
+    json_cfg.write_text('{"show_diff": false}', encoding="utf-8")
+    stat = json_cfg.stat()
+    os.utime(json_cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_project_config(tmp_path) == {"policy": "floor-only", "show_diff": False}
+    assert calls == ["reqsync.toml", "reqsync.json", "reqsync.json"]
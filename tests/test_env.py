@@ -9,18 +9,15 @@ from __future__ import annotations
 
 import subprocess
 from pathlib import Path
-
-from typer.testing import CliRunner
+from types import SimpleNamespace
 
 from reqsync import core as core_mod
 from reqsync import env as env_mod
 from reqsync._types import ExitCode
 from reqsync.cli import app
 
-runner = CliRunner()
-
 
-def test_venv_guard_blocks_without_system_ok(tmp_path: Path, monkeypatch) -> None:
+def test_venv_guard_blocks_without_system_ok(tmp_path: Path, monkeypatch, runner) -> None:
     req = tmp_path / "requirements.txt"
     req.write_text("pandas\n", encoding="utf-8")
 
@@ -31,28 +28,32 @@ def test_venv_guard_blocks_without_system_ok(tmp_path: Path, monkeypatch) -> Non
     assert "virtualenv" in result.output.lower()
 
 
-def test_run_pip_upgrade_filters_disallowed_args(monkeypatch, tmp_path: Path) -> None:
-    captured: dict[str, list[str]] = {}
-
-    def fake_run(*args, **kwargs):
-        captured["cmd"] = args[0]
+class _CaptureRun:
+    """Stand-in for subprocess.run that records the command it was given."""
 
-        class Response:
-            returncode = 0
-            stdout = "ok"
+    def __init__(self) -> None:
+        self.cmd: list[str] = []
 
-        return Response()
+    def __call__(self, cmd: list[str], **_kwargs) -> SimpleNamespace:
+        self.cmd = cmd
+        return SimpleNamespace(returncode=0, stdout="ok")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
 
-    code, out = core_mod.run_pip_upgrade(
-        str(tmp_path / "requirements.txt"),
-        timeout_sec=5,
-        extra_args="--index-url https://simple --bogus-flag --trusted-host pypi.org",
-    )
+def test_run_pip_upgrade_filters_disallowed_args(tmp_path: Path) -> None:
+    capture = _CaptureRun()
+    original_run = subprocess.run
+    subprocess.run = capture
+    try:
+        code, out = core_mod.run_pip_upgrade(
+            str(tmp_path / "requirements.txt"),
+            timeout_sec=5,
+            extra_args="--index-url https://simple --bogus-flag --trusted-host pypi.org",
+        )
+    finally:
+        subprocess.run = original_run
 
     assert code == 0 and out == "ok"
-    sent = " ".join(captured["cmd"])
+    sent = " ".join(capture.cmd)
     assert "--index-url" in sent and "--trusted-host" in sent
     assert "--bogus-flag" not in sent
 
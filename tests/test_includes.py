@@ -9,25 +9,24 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from reqsync import core as core_mod
 from reqsync._types import Options
 from reqsync.core import sync
 
+_BASE_WITH_LINKS = b"-r other.txt\n-c constraints.txt\npydantic\n"
+_CONSTRAINTS = b"pandas<2.0\n"
 
-def test_follow_includes_and_skip_constraints(tmp_path: Path, monkeypatch) -> None:
+
+def test_follow_includes_and_skip_constraints(tmp_path: Path, stub_sync_env) -> None:
     base = tmp_path / "base.txt"
     other = tmp_path / "other.txt"
     constraints = tmp_path / "constraints.txt"
 
-    base.write_text("-r other.txt\n-c constraints.txt\npydantic\n", encoding="utf-8")
-    other.write_text("pandas\n", encoding="utf-8")
-    constraints_original = "pandas<2.0\n"
-    constraints.write_text(constraints_original, encoding="utf-8")
+    base.write_bytes(_BASE_WITH_LINKS)
+    other.write_bytes(b"pandas\n")
+    constraints_original = _CONSTRAINTS.decode("utf-8")
+    constraints.write_bytes(_CONSTRAINTS)
 
-    monkeypatch.setattr(core_mod, "ensure_venv_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "ensure_git_clean_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "run_pip_upgrade", lambda *_args, **_kwargs: (0, "skipped"))
-    monkeypatch.setattr(core_mod, "get_installed_versions", lambda: {"pydantic": "2.7.0", "pandas": "2.2.2"})
+    stub_sync_env({"pydantic": "2.7.0", "pandas": "2.2.2"})
 
     result = sync(
         Options(
@@ -40,12 +39,39 @@ def test_follow_includes_and_skip_constraints(tmp_path: Path, monkeypatch) -> No
         )
     )
 
-    other_result = next(item for item in result.files if item.file.name == "other.txt")
-    base_result = next(item for item in result.files if item.file.name == "base.txt")
-    constraints_result = next(item for item in result.files if item.file.name == "constraints.txt")
+    by_name = {item.file.name: item for item in result.files}
+    constraints_result = by_name["constraints.txt"]
 
-    assert "pandas>=2.2.2" in other_result.new_text
-    assert "pydantic>=2.7.0" in base_result.new_text
+    assert "pandas>=2.2.2" in by_name["other.txt"].new_text
+    assert "pydantic>=2.7.0" in by_name["base.txt"].new_text
     assert constraints_result.role == "constraint"
     assert constraints_result.new_text.replace("\r\n", "\n") == constraints_original
     assert constraints.read_text(encoding="utf-8").replace("\r\n", "\n") == constraints_original
+
+
+def test_results_follow_include_order(tmp_path: Path, stub_sync_env) -> None:
+    names = [f"part{index}.txt" for index in range(6)]
+    base = tmp_path / "base.txt"
+    base.write_text("".join(f"-r {name}\n" for name in names), encoding="utf-8")
+    for index, name in enumerate(names):
+        (tmp_path / name).write_text(f"pkg{index}\n", encoding="utf-8")
+
+    stub_sync_env({f"pkg{index}": "1.0" for index in range(6)})
+
+    result = sync(Options(path=base, follow_includes=True, system_ok=True, no_upgrade=True, dry_run=True))
+
+    assert [item.file.name for item in result.files] == ["base.txt", *names]
+    assert [item.new_text for item in result.files[1:]] == [f"pkg{index}>=1.0\n" for index in range(6)]
+
+
+def test_hash_pinned_constraints_do_not_block_when_not_updated(tmp_path: Path, stub_sync_env) -> None:
+    base = tmp_path / "base.txt"
+    constraints = tmp_path / "constraints.txt"
+    base.write_text("-c constraints.txt\npandas\n", encoding="utf-8")
+    constraints.write_text("pandas==2.2.2 --hash=sha256:abc\n", encoding="utf-8")
+
+    stub_sync_env({"pandas": "2.2.2"})
+
+    result = sync(Options(path=base, follow_includes=True, system_ok=True, no_upgrade=True, dry_run=True))
+
+    assert [item.new_text for item in result.files] == ["-c constraints.txt\npandas>=2.2.2\n", constraints.read_text()]
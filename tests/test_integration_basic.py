@@ -11,17 +11,14 @@ from reqsync import core as core_mod
 from reqsync._types import Options
 from reqsync.core import sync
 
+_REQUESTS_WITH_COMMENT = b"requests\n# trailing comment\n"
 
-def test_end_to_end_write_backup_and_idempotence(tmp_path, monkeypatch) -> None:
-    req = tmp_path / "requirements.txt"
-    req.write_text("requests\n# trailing comment\n", encoding="utf-8")
 
-    core_mod.get_installed_versions.cache_clear()
+def test_end_to_end_write_backup_and_idempotence(tmp_path, stub_sync_env) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_bytes(_REQUESTS_WITH_COMMENT)
 
-    monkeypatch.setattr(core_mod, "ensure_venv_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "ensure_git_clean_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "run_pip_upgrade", lambda *_args, **_kwargs: (0, "skipped"))
-    monkeypatch.setattr(core_mod, "get_installed_versions", lambda: {"requests": "2.32.3"})
+    stub_sync_env({"requests": "2.32.3"})
 
     options = Options(path=req, system_ok=True, no_upgrade=True, show_diff=True)
 
@@ -32,3 +29,68 @@ def test_end_to_end_write_backup_and_idempotence(tmp_path, monkeypatch) -> None:
 
     second = sync(options)
     assert not second.changed
+
+
+def test_only_and_exclude_globs_filter_rewrites(tmp_path, stub_sync_env) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_text("pandas\nnumpy\npydantic\npydantic-core\n", encoding="utf-8")
+
+    stub_sync_env({"pandas": "2.2.2", "numpy": "1.26.4", "pydantic": "2.7.0", "pydantic-core": "2.18.2"})
+
+    options = Options(
+        path=req,
+        system_ok=True,
+        no_upgrade=True,
+        dry_run=True,
+        only=("pandas", "pydantic*"),
+        exclude=("pydantic-core",),
+    )
+    result = sync(options)
+
+    assert [change.package for change in result.files[0].changes] == ["pandas", "pydantic"]
+    file_result = result.files[0]
+    assert file_result.original_lines is not None and file_result.new_lines is not None
+    assert "".join(file_result.original_lines) == file_result.original_text
+    assert "".join(file_result.new_lines) == file_result.new_text
+
+
+def test_compiled_patterns_split_literals_suffixes_and_globs() -> None:
+    patterns = core_mod._compile_patterns(("pandas", "*-core", "py?ant*"))
+    assert patterns is not None
+    assert patterns.literals == frozenset({"pandas"})
+    assert patterns.suffixes == ("-core",)
+    assert [name for name in ("pandas", "pydantic-core", "pydantic", "numpy") if patterns.matches(name)] == [
+        "pandas",
+        "pydantic-core",
+        "pydantic",
+    ]
+
+
+def test_last_wins_rewrites_only_final_duplicate(tmp_path, stub_sync_env) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_text("pandas>=1.0\nnumpy\npandas>=1.5 # final\n", encoding="utf-8")
+
+    stub_sync_env({"pandas": "2.2.2", "numpy": "1.26.4"})
+
+    result = sync(Options(path=req, system_ok=True, no_upgrade=True, dry_run=True, last_wins=True))
+
+    assert result.files[0].new_text == "pandas>=1.0\nnumpy>=1.26.4\npandas>=2.2.2 # final\n"
+
+
+def test_upgrade_invalidates_metadata_caches_before_reading_versions(tmp_path, stub_sync_env, monkeypatch) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_bytes(b"requests\n")
+
+    events: list[str] = []
+    monkeypatch.setattr(core_mod.importlib, "invalidate_caches", lambda: events.append("invalidate"))
+
+    def installed() -> dict[str, str]:
+        events.append("read")
+        return {"requests": "2.32.3"}
+
+    monkeypatch.setattr(core_mod, "get_installed_versions", installed)
+
+    result = sync(Options(path=req, system_ok=True, dry_run=True))
+
+    assert result.changed
+    assert events == ["invalidate", "read"]
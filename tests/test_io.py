@@ -7,22 +7,30 @@ and direct read/write round-trips.
 
 from __future__ import annotations
 
+import itertools
+import os
+import stat
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
 from reqsync import core as core_mod
 from reqsync import io as io_mod
 from reqsync._types import Options
 from reqsync.core import sync
+from reqsync.errors import WriteRollbackError
 from reqsync.io import backup_file, read_text_preserve, write_text_preserve
 
+_BOM_CRLF_PANDAS = b"\xef\xbb\xbfpandas\r\n"
 
-def test_preserve_bom_and_newlines_on_write(tmp_path, monkeypatch) -> None:
+
+def test_preserve_bom_and_newlines_on_write(tmp_path, stub_sync_env) -> None:
     target = tmp_path / "requirements.txt"
-    raw = "\ufeffpandas\n".encode()
-    target.write_bytes(raw.replace(b"\n", b"\r\n"))
+    target.write_bytes(_BOM_CRLF_PANDAS)
 
-    monkeypatch.setattr(core_mod, "ensure_venv_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "ensure_git_clean_or_exit", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(core_mod, "run_pip_upgrade", lambda *_args, **_kwargs: (0, "skipped"))
-    monkeypatch.setattr(core_mod, "get_installed_versions", lambda: {"pandas": "2.2.2"})
+    stub_sync_env({"pandas": "2.2.2"})
 
     result = sync(Options(path=target, system_ok=True, no_upgrade=True))
     assert result.changed
@@ -32,61 +40,179 @@ def test_preserve_bom_and_newlines_on_write(tmp_path, monkeypatch) -> None:
     assert b"\r\n" in data and b"\n" not in data.replace(b"\r\n", b"")
 
 
-def test_read_write_roundtrip_preserves_format(tmp_path) -> None:
+@pytest.mark.parametrize(
+    ("sample", "bom", "newline"),
+    [
+        pytest.param(b"\xef\xbb\xbfline1\r\nline2\r\n", True, "\r\n", id="bom-crlf"),
+        pytest.param(b"line1\nline2\n", False, "\n", id="plain-lf"),
+        pytest.param(b"\xef\xbb\xbfline1\nline2\n", True, "\n", id="bom-lf"),
+    ],
+)
+def test_read_write_roundtrip_preserves_format(tmp_path, sample: bytes, bom: bool, newline: str) -> None:
     path = tmp_path / "x.txt"
-    path.write_bytes(b"\xef\xbb\xbfline1\r\nline2\r\n")
+    path.write_bytes(sample)
+
+    text, detected_newline, detected_bom = read_text_preserve(path)
+    assert detected_newline == newline and detected_bom is bom
+
+    write_text_preserve(path, text, detected_bom)
+    assert path.read_bytes() == sample
+
+
+def _timestamped_backups(directory: Path) -> list[Path]:
+    """List timestamped requirements.txt backups from one directory scan."""
+
+    with os.scandir(directory) as entries:
+        return sorted(Path(entry.path) for entry in entries if entry.name.startswith("requirements.txt.bak."))
+
+
+class _CountingDateTime:
+    """datetime stand-in whose now() yields strictly increasing timestamps."""
+
+    _counter = itertools.count()
+
+    @classmethod
+    def now(cls) -> SimpleNamespace:
+        stamp = f"20260223-000000-{next(cls._counter):06d}"
+        return SimpleNamespace(strftime=lambda _fmt: stamp)
+
 
-    text, newline, bom = read_text_preserve(path)
-    assert newline == "\r\n" and bom is True
+class _FixedNow:
+    @staticmethod
+    def strftime(_fmt: str) -> str:
+        return "20260223-000000-000000"
 
-    write_text_preserve(path, text, bom)
-    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
 
+class _FixedDateTime:
+    """datetime stand-in whose now() always yields the same timestamp."""
 
-def test_timestamped_backup_pruning_keeps_recent_files(tmp_path) -> None:
+    @staticmethod
+    def now() -> _FixedNow:
+        return _FixedNow()
+
+
+@pytest.fixture
+def fixed_datetime(monkeypatch) -> None:
+    """Freeze the timestamp used for backup names."""
+
+    monkeypatch.setattr(io_mod, "datetime", _FixedDateTime)
+
+
+def test_timestamped_backup_pruning_keeps_recent_files(tmp_path, monkeypatch) -> None:
     target = tmp_path / "requirements.txt"
-    target.write_text("requests>=2.0\n", encoding="utf-8")
+    target.write_bytes(b"requests>=2.0\n")
+    monkeypatch.setattr(io_mod, "datetime", _CountingDateTime)
 
-    for i in range(6):
-        target.write_text(f"requests>={i}.0\n", encoding="utf-8")
-        backup_file(target, suffix=".bak", timestamped=True, keep_last=3)
+    # Each backup gets its own inode (the target is replaced atomically in
+    # between) so it can carry its own mtime. The mtimes run against the name
+    # order, so pruning must go by mtime rather than the name tiebreak.
+    older = []
+    for index in range(5):
+        write_text_preserve(target, f"requests>={index}.0\n", bom=False)
+        older.append(backup_file(target, suffix=".bak", timestamped=True, keep_last=0))
+    for age, backup in enumerate(older):
+        stamp = 1_000_000_000 - age * 60
+        os.utime(backup, (stamp, stamp))
 
-    backups = sorted(tmp_path.glob("requirements.txt.bak.*"))
-    assert len(backups) == 3
+    write_text_preserve(target, "requests>=5.0\n", bom=False)
+    newest = backup_file(target, suffix=".bak", timestamped=True, keep_last=3)
+
+    backups = _timestamped_backups(tmp_path)
+    assert backups == sorted([older[0], older[1], newest])
 
 
 def test_timestamped_backup_pruning_can_be_disabled(tmp_path) -> None:
     target = tmp_path / "requirements.txt"
     target.write_text("requests>=2.0\n", encoding="utf-8")
 
+    created = []
     for i in range(4):
-        target.write_text(f"requests>={i}.0\n", encoding="utf-8")
-        backup_file(target, suffix=".bak", timestamped=True, keep_last=0)
+        write_text_preserve(target, f"requests>={i}.0\n", bom=False)
+        created.append(backup_file(target, suffix=".bak", timestamped=True, keep_last=0))
 
-    backups = sorted(tmp_path.glob("requirements.txt.bak.*"))
+    backups = _timestamped_backups(tmp_path)
     assert len(backups) == 4
+    assert [backup.read_text(encoding="utf-8") for backup in created] == [f"requests>={i}.0\n" for i in range(4)]
 
 
-def test_timestamped_backup_naming_avoids_collisions(tmp_path, monkeypatch) -> None:
+def test_timestamped_backup_naming_avoids_collisions(tmp_path, fixed_datetime) -> None:
     target = tmp_path / "requirements.txt"
     target.write_text("requests>=2.0\n", encoding="utf-8")
 
-    class _FixedNow:
-        @staticmethod
-        def strftime(_fmt: str) -> str:
-            return "20260223-000000-000000"
-
-    class _FixedDateTime:
-        @staticmethod
-        def now() -> _FixedNow:
-            return _FixedNow()
-
-    monkeypatch.setattr(io_mod, "datetime", _FixedDateTime)
-
+    created = []
     for i in range(3):
-        target.write_text(f"requests>={i}.0\n", encoding="utf-8")
-        backup_file(target, suffix=".bak", timestamped=True, keep_last=0)
+        write_text_preserve(target, f"requests>={i}.0\n", bom=False)
+        created.append(backup_file(target, suffix=".bak", timestamped=True, keep_last=0))
 
-    backups = sorted(tmp_path.glob("requirements.txt.bak.*"))
+    backups = _timestamped_backups(tmp_path)
     assert len(backups) == 3
     assert len({backup.name for backup in backups}) == 3
+    assert [backup.read_text(encoding="utf-8") for backup in created] == [f"requests>={i}.0\n" for i in range(3)]
+
+
+def test_backup_survives_atomic_rewrite_of_original(tmp_path) -> None:
+    target = tmp_path / "requirements.txt"
+    target.write_text("requests>=2.0\n", encoding="utf-8")
+
+    backup = backup_file(target, suffix=".bak", timestamped=False, keep_last=0)
+    write_text_preserve(target, "requests>=2.32.3\n", bom=False)
+
+    assert backup.read_text(encoding="utf-8") == "requests>=2.0\n"
+    assert target.read_text(encoding="utf-8") == "requests>=2.32.3\n"
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path, monkeypatch) -> None:
+    target = tmp_path / "requirements.txt"
+    target.write_bytes(b"old\n")
+    target.chmod(0o640)
+
+    # Only exercise the O_TMPFILE path where the platform supports it.
+    for use_o_tmpfile in (True, False) if io_mod._USE_O_TMPFILE else (False,):
+        monkeypatch.setattr(io_mod, "_USE_O_TMPFILE", use_o_tmpfile)
+        io_mod.write_atomic_bytes(target, b"new\n")
+        assert target.read_bytes() == b"new\n"
+        if sys.platform != "win32":
+            assert stat.S_IMODE(target.stat().st_mode) == 0o640
+        assert [item.name for item in tmp_path.iterdir()] == ["requirements.txt"]
+
+
+def test_read_large_file_detects_bom_and_newlines(tmp_path) -> None:
+    target = tmp_path / "constraints.txt"
+    body = "".join(f"pkg{index}==1.0\r\n" for index in range(10000))
+    target.write_bytes(b"\xef\xbb\xbf" + body.encode("utf-8"))
+
+    text, newline, has_bom = read_text_preserve(target)
+
+    assert text == body
+    assert newline == "\r\n"
+    assert has_bom is True
+
+
+def test_failed_write_detaches_hard_linked_backup(tmp_path, stub_sync_env, monkeypatch) -> None:
+    target = tmp_path / "requirements.txt"
+    target.write_bytes(b"requests\n")
+    stub_sync_env({"requests": "2.32.3"})
+
+    def failing_write(*_args, **_kwargs) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(core_mod, "write_text_preserve", failing_write)
+
+    with pytest.raises(WriteRollbackError):
+        sync(Options(path=target, system_ok=True, no_upgrade=True, timestamped_backups=False))
+
+    backup = tmp_path / "requirements.txt.bak"
+    assert not os.path.samefile(target, backup)
+
+    with open(target, "ab") as stream:
+        stream.write(b"numpy\n")
+    assert backup.read_bytes() == b"requests\n"
+
+
+def test_anonymous_write_reports_unsupported_without_o_tmpfile(tmp_path, monkeypatch) -> None:
+    target = tmp_path / "requirements.txt"
+    target.write_bytes(b"old\n")
+    monkeypatch.delattr(os, "O_TMPFILE", raising=False)
+
+    assert io_mod._write_atomic_anonymous(target, b"new\n", None) is False
+    assert target.read_bytes() == b"old\n"
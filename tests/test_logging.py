@@ -0,0 +1,57 @@
+# ./tests/test_logging.py
+"""Logging setup tests.
+
+Covers handler reuse across repeated setup_logging calls and closing of the
+previous log file handler when the sink changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from reqsync import _logging as logging_mod
+from reqsync._logging import setup_logging
+
+
+@pytest.fixture
+def restore_root_logging() -> Iterator[None]:
+    root = logging.getLogger()
+    saved_handlers = list(root.handlers)
+    saved_level = root.level
+    saved_state = (logging_mod._CURRENT, logging_mod._CURRENT_HANDLERS)
+    try:
+        yield
+    finally:
+        for handler in root.handlers:
+            if handler not in saved_handlers:
+                handler.close()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        logging_mod._CURRENT, logging_mod._CURRENT_HANDLERS = saved_state
+
+
+def test_repeat_setup_logging_reuses_handlers(tmp_path: Path, restore_root_logging) -> None:
+    log_file = tmp_path / "reqsync.log"
+
+    setup_logging(verbosity=1, quiet=False, log_file=log_file)
+    first = list(logging.getLogger().handlers)
+    setup_logging(verbosity=1, quiet=False, log_file=log_file)
+
+    handlers = logging.getLogger().handlers
+    assert len(handlers) == 2
+    assert all(new is old for new, old in zip(handlers, first))
+
+
+def test_changing_log_file_closes_previous_file_handler(tmp_path: Path, restore_root_logging) -> None:
+    setup_logging(verbosity=1, quiet=False, log_file=tmp_path / "first.log")
+    (previous,) = [handler for handler in logging.getLogger().handlers if isinstance(handler, logging.FileHandler)]
+    assert previous.stream is not None
+
+    setup_logging(verbosity=1, quiet=False, log_file=tmp_path / "second.log")
+
+    assert previous.stream is None
+    assert previous not in logging.getLogger().handlers
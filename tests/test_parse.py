@@ -10,7 +10,13 @@ from __future__ import annotations
 import pytest
 
 from reqsync.errors import HashPinsPresentError
-from reqsync.parse import find_file_links, guard_hashes, parse_line
+from reqsync.parse import (
+    find_file_links,
+    find_file_links_split,
+    guard_hashes,
+    invalidate_parse_cache,
+    parse_line,
+)
 
 
 def test_parse_line_classifies_package_and_preserves_comment() -> None:
@@ -46,3 +52,31 @@ def test_guard_hashes_raises_without_allow_hashes() -> None:
         guard_hashes(["requests==2.31.0 --hash=sha256:abc"], allow_hashes=False)
 
     guard_hashes(["requests==2.31.0 --hash=sha256:abc"], allow_hashes=True)
+
+
+def test_guard_hashes_accepts_whole_file_text() -> None:
+    with pytest.raises(HashPinsPresentError):
+        guard_hashes("pandas\nrequests==2.31.0 --hash=sha256:abc\n", allow_hashes=False)
+
+    guard_hashes("pandas\nrequests==2.31.0\n", allow_hashes=False)
+    guard_hashes(iter(["pandas\n", "numpy\n"]), allow_hashes=False)
+
+
+def test_parse_line_exposes_canonical_name_for_packages() -> None:
+    assert parse_line("Zope.Interface[test]>=5\n").canonical_name == "zope-interface"
+    assert parse_line("# just a comment\n").canonical_name is None
+
+
+def test_parse_line_memoizes_but_warns_on_every_unparseable_line(caplog) -> None:
+    invalidate_parse_cache()
+    assert parse_line("requests==2.32.3\n") is parse_line("requests==2.32.3\n")
+
+    with caplog.at_level("WARNING"):
+        parse_line("not a valid ==== requirement\n")
+        parse_line("not a valid ==== requirement\n")
+    assert sum("Unparseable requirement" in record.message for record in caplog.records) == 2
+
+
+def test_find_file_links_split_returns_includes_and_constraints() -> None:
+    lines = ["-r base.txt\n", "-c constraints.txt\n", "--requirement extra.txt\n", "pandas\n"]
+    assert find_file_links_split(lines) == (["base.txt", "extra.txt"], ["constraints.txt"])
@@ -0,0 +1,49 @@
+# ./tests/test_report.py
+"""Reporting helper tests.
+
+Checks multi-file diff assembly and JSON serialization used by the CLI, API,
+and MCP outputs.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+from pathlib import Path
+
+from reqsync._types import FileChange
+from reqsync.report import make_diff, to_json_report, write_json_report
+
+
+def test_make_diff_separates_changed_files_and_skips_unchanged() -> None:
+    files = [
+        FileChange(file=Path("a.txt"), role="root", original_text="pandas\n", new_text="pandas>=2.2.2\n"),
+        FileChange(file=Path("b.txt"), role="requirement", original_text="numpy\n", new_text="numpy\n"),
+        FileChange(file=Path("c.txt"), role="requirement", original_text="rich\n", new_text="rich>=13.0\n"),
+    ]
+
+    expected = "\n".join(
+        "".join(
+            difflib.unified_diff(
+                item.original_text.splitlines(keepends=True),
+                item.new_text.splitlines(keepends=True),
+                fromfile=f"{item.file} (old)",
+                tofile=f"{item.file} (new)",
+            )
+        )
+        for item in (files[0], files[2])
+    )
+    assert make_diff(files) == expected
+    assert make_diff([files[1]]) == ""
+
+
+def test_write_json_report_is_pretty_unless_compact(tmp_path: Path) -> None:
+    report = to_json_report([])
+
+    compact = write_json_report(report, str(tmp_path / "compact.json"), pretty=False)
+    pretty = write_json_report(report, str(tmp_path / "pretty.json"))
+
+    assert json.loads(compact.read_text(encoding="utf-8")) == report
+    assert "\n" not in compact.read_text(encoding="utf-8")
+    assert json.loads(pretty.read_text(encoding="utf-8")) == report
+    assert '\n  "changed"' in pretty.read_text(encoding="utf-8")